@@ -23,12 +23,110 @@ from __future__ import annotations
 import random
 from typing import Optional
 
-from state import GameStateTD, ensure_player
+from state import ZONE_BAG, ZONE_DESKTOP, ZONE_PALM, ZONE_POT, GameStateTD, ensure_player
+
+
+# -----------------------------
+# Zone list helpers
+# -----------------------------
+def _remove_from_zone(zone: list[str], chip_id: str, *, ordered: bool) -> None:
+    """
+    Remove `chip_id` from a zone list without a full `list.remove` shift.
+
+    - The chip moved is usually the most recently added one, so the tail is
+      checked first (O(1) pop).
+    - Unordered zones (palm, desktop) swap the last element into the hole.
+    - Ordered zones (pot: order matters for e.g. the yellow rule) delete in place.
+
+    Raises ValueError if the chip is not in the zone.
+    """
+    if zone and zone[-1] == chip_id:
+        zone.pop()
+        return
+
+    i = zone.index(chip_id)
+    if ordered:
+        del zone[i]
+    else:
+        zone[i] = zone[-1]
+        zone.pop()
+
+
+def _sample_out_of_bag(bag: list[str], n: int, rng: random.Random) -> list[str]:
+    """
+    Remove up to `n` chips uniformly at random (without replacement) from `bag`.
+    Returns the chip_ids in draw order.
+
+    One `rng.sample` call picks all indices; they are then swap-popped in
+    descending order so an earlier removal never disturbs a later index.
+    """
+    k = min(n, len(bag))
+    if k <= 0:
+        return []
+
+    picks = rng.sample(range(len(bag)), k)
+    drawn = [bag[i] for i in picks]
+    for i in sorted(picks, reverse=True):
+        bag[i] = bag[-1]
+        bag.pop()
+    return drawn
+
+
+def _pot_add(state: GameStateTD, player_id: int, chip_id: str) -> None:
+    """
+    Append `chip_id` to the player's pot and bump the running pot sums / color counts.
+    Every chip entering a pot goes through here.
+
+    The gray sum is bumped by `value * is_gray` (bool as 0/1), no branch on color.
+    """
+    state["pots"][player_id].append(chip_id)
+    val = state["chip_value"][chip_id]
+    state["pot_total_sum"][player_id] += val
+    state["pot_gray_sum"][player_id] += val * state["chip_is_gray"][chip_id]
+    state["pot_color_counts"][player_id][state["chip_color"][chip_id]] += 1
+
+
+def _pot_sub(state: GameStateTD, player_id: int, chip_id: str) -> None:
+    """
+    Lower the running pot sums / color counts for a chip that just left the player's pot.
+    """
+    val = state["chip_value"][chip_id]
+    state["pot_total_sum"][player_id] -= val
+    state["pot_gray_sum"][player_id] -= val * state["chip_is_gray"][chip_id]
+    state["pot_color_counts"][player_id][state["chip_color"][chip_id]] -= 1
 
 
 # -----------------------------
 # Bag -> Pot (direct draw)
 # -----------------------------
+def _draw_one(
+    state: GameStateTD,
+    player_id: int,
+    bag: list[str],
+    zone: int,
+    rng: random.Random,
+) -> str:
+    """
+    Shared core of `draw_from_bag` / `draw_from_bag_to_palm`: swap-pop one random
+    chip out of `bag` into the player's pot (ZONE_POT) or palm (ZONE_PALM).
+
+    For callers that already ran `ensure_player`, bound the player's (non-empty)
+    bag and resolved the RNG.
+    """
+    i = rng.randrange(len(bag))
+    chip_id = bag[i]
+    bag[i] = bag[-1]
+    bag.pop()
+
+    if zone == ZONE_POT:
+        _pot_add(state, player_id, chip_id)
+    else:
+        state["palms"][player_id].append(chip_id)
+    state["where"][chip_id] = (zone, player_id)
+
+    return chip_id
+
+
 def draw_from_bag(
     state: GameStateTD,
     player_id: int,
@@ -45,17 +143,7 @@ def draw_from_bag(
     if not bag:
         raise ValueError(f"Player {player_id} bag is empty")
 
-    rng = rng or random
-
-    i = rng.randrange(len(bag))
-    chip_id = bag[i]
-    bag[i] = bag[-1]
-    bag.pop()
-
-    state["pots"][player_id].append(chip_id)
-    state["where"][chip_id] = {"zone": "pot", "player": player_id}
-
-    return chip_id
+    return _draw_one(state, player_id, bag, ZONE_POT, rng or random)
 
 
 def draw_n_from_bag(
@@ -68,14 +156,18 @@ def draw_n_from_bag(
     """
     Draw up to `n` chips from the player's bag, or stop early if the bag empties.
     Returns chip_ids in draw order.
+
+    The player check and RNG resolution run once here, not once per chip.
     """
+    ensure_player(state, player_id)
+    rng = rng or random
+
+    bag = state["bags"][player_id]
     drawn: list[str] = []
     for _ in range(n):
-        if not state["bags"].get(player_id):
-            break
-        if len(state["bags"][player_id]) == 0:
+        if not bag:
             break
-        drawn.append(draw_from_bag(state, player_id, rng=rng))
+        drawn.append(_draw_one(state, player_id, bag, ZONE_POT, rng))
     return drawn
 
 
@@ -98,17 +190,7 @@ def draw_from_bag_to_palm(
     if not bag:
         raise ValueError(f"Player {player_id} bag is empty")
 
-    rng = rng or random
-
-    i = rng.randrange(len(bag))
-    chip_id = bag[i]
-    bag[i] = bag[-1]
-    bag.pop()
-
-    state["palms"][player_id].append(chip_id)
-    state["where"][chip_id] = {"zone": "palm", "player": player_id}
-
-    return chip_id
+    return _draw_one(state, player_id, bag, ZONE_PALM, rng or random)
 
 
 def draw_n_from_bag_to_palm(
@@ -121,15 +203,17 @@ def draw_n_from_bag_to_palm(
     """
     Draw up to `n` chips from bag to palm. Stops early if bag empties.
     Returns chip_ids in draw order.
+
+    All indices are sampled in one call, then the chips are moved as a batch.
     """
     ensure_player(state, player_id)
     rng = rng or random
 
-    drawn: list[str] = []
-    for _ in range(n):
-        if len(state["bags"][player_id]) == 0:
-            break
-        drawn.append(draw_from_bag_to_palm(state, player_id, rng=rng))
+    drawn = _sample_out_of_bag(state["bags"][player_id], n, rng)
+
+    state["palms"][player_id].extend(drawn)
+    state["where"].update(dict.fromkeys(drawn, (ZONE_PALM, player_id)))
+
     return drawn
 
 
@@ -141,12 +225,22 @@ def move_chip_palm_to_pot(state: GameStateTD, player_id: int, chip_id: str) -> N
 
     palm = state["palms"][player_id]
     try:
-        palm.remove(chip_id)
+        _remove_from_zone(palm, chip_id, ordered=False)
     except ValueError:
         raise ValueError(f"Chip {chip_id} not found in player {player_id} palm")
 
-    state["pots"][player_id].append(chip_id)
-    state["where"][chip_id] = {"zone": "pot", "player": player_id}
+    _pot_add(state, player_id, chip_id)
+    state["where"][chip_id] = (ZONE_POT, player_id)
+
+
+def place_one_and_flush_palm(state: GameStateTD, player_id: int, chip_id: str) -> list[str]:
+    """
+    Move a specific chip from player's palm into player's pot, then return the
+    rest of the palm to the bag (the palm is always emptied after placement).
+    Returns the list of chip_ids returned to the bag.
+    """
+    move_chip_palm_to_pot(state, player_id, chip_id)
+    return return_all_palm_to_bag(state, player_id)
 
 
 def return_chip_palm_to_bag(state: GameStateTD, player_id: int, chip_id: str) -> None:
@@ -157,12 +251,12 @@ def return_chip_palm_to_bag(state: GameStateTD, player_id: int, chip_id: str) ->
 
     palm = state["palms"][player_id]
     try:
-        palm.remove(chip_id)
+        _remove_from_zone(palm, chip_id, ordered=False)
     except ValueError:
         raise ValueError(f"Chip {chip_id} not found in player {player_id} palm")
 
     state["bags"][player_id].append(chip_id)
-    state["where"][chip_id] = {"zone": "bag", "player": player_id}
+    state["where"][chip_id] = (ZONE_BAG, player_id)
 
 
 def return_all_palm_to_bag(state: GameStateTD, player_id: int) -> list[str]:
@@ -177,9 +271,8 @@ def return_all_palm_to_bag(state: GameStateTD, player_id: int) -> list[str]:
         return []
 
     returned = list(palm)
-    for cid in returned:
-        state["bags"][player_id].append(cid)
-        state["where"][cid] = {"zone": "bag", "player": player_id}
+    state["bags"][player_id].extend(returned)
+    state["where"].update(dict.fromkeys(returned, (ZONE_BAG, player_id)))
 
     palm.clear()
     return returned
@@ -200,12 +293,12 @@ def move_chip_palm_to_desktop(state: GameStateTD, player_id: int, chip_id: str)
 
     palm = state["palms"][player_id]
     try:
-        palm.remove(chip_id)
+        _remove_from_zone(palm, chip_id, ordered=False)
     except ValueError:
         raise ValueError(f"Chip {chip_id} not found in player {player_id} palm")
 
     state["desktops"][player_id].append(chip_id)
-    state["where"][chip_id] = {"zone": "desktop", "player": player_id}
+    state["where"][chip_id] = (ZONE_DESKTOP, player_id)
 
 
 def move_chip_desktop_to_bag(state: GameStateTD, player_id: int, chip_id: str) -> None:
@@ -216,12 +309,12 @@ def move_chip_desktop_to_bag(state: GameStateTD, player_id: int, chip_id: str) -
 
     desk = state["desktops"][player_id]
     try:
-        desk.remove(chip_id)
+        _remove_from_zone(desk, chip_id, ordered=False)
     except ValueError:
         raise ValueError(f"Chip {chip_id} not found on player {player_id} desktop")
 
     state["bags"][player_id].append(chip_id)
-    state["where"][chip_id] = {"zone": "bag", "player": player_id}
+    state["where"][chip_id] = (ZONE_BAG, player_id)
 
 
 def move_chip_desktop_to_pot(state: GameStateTD, player_id: int, chip_id: str) -> None:
@@ -232,12 +325,12 @@ def move_chip_desktop_to_pot(state: GameStateTD, player_id: int, chip_id: str) -
 
     desk = state["desktops"][player_id]
     try:
-        desk.remove(chip_id)
+        _remove_from_zone(desk, chip_id, ordered=False)
     except ValueError:
         raise ValueError(f"Chip {chip_id} not found on player {player_id} desktop")
 
-    state["pots"][player_id].append(chip_id)
-    state["where"][chip_id] = {"zone": "pot", "player": player_id}
+    _pot_add(state, player_id, chip_id)
+    state["where"][chip_id] = (ZONE_POT, player_id)
 
 
 # -----------------------------
@@ -255,12 +348,13 @@ def return_chip_from_pot_to_bag(state: GameStateTD, player_id: int, chip_id: str
 
     pot = state["pots"][player_id]
     try:
-        pot.remove(chip_id)
+        _remove_from_zone(pot, chip_id, ordered=True)
     except ValueError:
         raise ValueError(f"Chip {chip_id} not found in player {player_id} pot")
+    _pot_sub(state, player_id, chip_id)
 
     state["bags"][player_id].append(chip_id)
-    state["where"][chip_id] = {"zone": "bag", "player": player_id}
+    state["where"][chip_id] = (ZONE_BAG, player_id)
     
 def return_all_pot_to_bag(state: GameStateTD, player_id: int) -> list[str]:
     """
@@ -276,11 +370,14 @@ def return_all_pot_to_bag(state: GameStateTD, player_id: int) -> list[str]:
         return []
 
     returned = list(pot)
-    for cid in returned:
-        state["bags"][player_id].append(cid)
-        state["where"][cid] = {"zone": "bag", "player": player_id}
+    state["bags"][player_id].extend(returned)
+    state["where"].update(dict.fromkeys(returned, (ZONE_BAG, player_id)))
 
     pot.clear()
+    state["pot_gray_sum"][player_id] = 0
+    state["pot_total_sum"][player_id] = 0
+    counts = state["pot_color_counts"][player_id]
+    counts[:] = [0] * len(counts)
     return returned
 
 
@@ -290,25 +387,16 @@ def return_all_pot_to_bag(state: GameStateTD, player_id: int) -> list[str]:
 # -----------------------------
 def pot_sums(state: GameStateTD, player_id: int) -> tuple[int, int]:
     """
-    Compute (gray_sum, total_sum) for the chips currently in player's pot.
+    Return (gray_sum, total_sum) for the chips currently in player's pot.
 
     gray_sum: sum of values where chip_type.color == "gray"
     total_sum: sum of values across all chips in pot
+
+    Both are running sums kept up to date by the pot mutators above
+    (`_pot_add` / `_pot_sub`), so this is O(1).
     """
     ensure_player(state, player_id)
-
-    gray_sum = 0
-    total_sum = 0
-
-    for cid in state["pots"][player_id]:
-        tid = state["chips"][cid]["type_id"]
-        ctype = state["chip_types"][tid]
-        val = int(ctype["value"])
-        total_sum += val
-        if ctype["color"] == "gray":
-            gray_sum += val
-
-    return gray_sum, total_sum
+    return state["pot_gray_sum"][player_id], state["pot_total_sum"][player_id]
 
 
 def take_any_chip_of_color_from_box_to_bag(state: GameStateTD, player_id: int, *, color: str) -> str:
@@ -317,17 +405,21 @@ def take_any_chip_of_color_from_box_to_bag(state: GameStateTD, player_id: int, *
     Returns the chip_id taken.
 
     Used by purple events like EV13/EV14 ("take 1 purple chip").
+
+    Pops from the per-color box bucket (smallest chip_id first, as before),
+    skipping entries that already left the box through other setup paths.
     """
     ensure_player(state, player_id)
 
-    # Find any chip in the box whose chip_type color matches
-    for cid in sorted(state["box"]):
-        tid = state["chips"][cid]["type_id"]
-        ctype = state["chip_types"][tid]
-        if ctype["color"] == color:
-            state["box"].remove(cid)
-            state["bags"][player_id].append(cid)
-            state["where"][cid] = {"zone": "bag", "player": player_id}
-            return cid
+    box = state["box"]
+    bucket = state["box_by_color"].get(color, [])
+    while bucket:
+        cid = bucket.pop()
+        if cid not in box:
+            continue
+        box.remove(cid)
+        state["bags"][player_id].append(cid)
+        state["where"][cid] = (ZONE_BAG, player_id)
+        return cid
 
     raise ValueError(f"No chip of color '{color}' left in box.")
@@ -15,13 +15,13 @@ You are expected to fill in BOARD_FIELDS with the real game data.
 
 from __future__ import annotations
 
-from typing import List, TypedDict
+from typing import List, NamedTuple, Tuple
 
 
 # -----------------------------
 # Board field definition
 # -----------------------------
-class BoardFieldTD(TypedDict):
+class BoardField(NamedTuple):
     coins: int              # money gained when landing here
     victory_points: int     # VP gained when landing here
     ruby: bool              # whether a ruby is gained
@@ -30,113 +30,138 @@ class BoardFieldTD(TypedDict):
 # -----------------------------
 # EMPTY board (index = list position)
 # -----------------------------
-BOARD_FIELDS: List[BoardFieldTD] = [
+BOARD_FIELDS: List[BoardField] = [
     # index 0
-    {"coins": 0, "victory_points": 0, "ruby": False},
+    BoardField(0, 0, False),
     # index 1
-    {"coins": 0, "victory_points": 0, "ruby": False},
+    BoardField(0, 0, False),
     # index 2
-    {"coins": 0, "victory_points": 0, "ruby": False},
+    BoardField(0, 0, False),
     # index 3
-    {"coins": 0, "victory_points": 0, "ruby": False},
+    BoardField(0, 0, False),
     # index 4
-    {"coins": 0, "victory_points": 0, "ruby": False},
+    BoardField(0, 0, False),
     # index 5
-    {"coins": 0, "victory_points": 0, "ruby": True},
+    BoardField(0, 0, True),
     # index 6
-    {"coins": 6, "victory_points": 1, "ruby": False},
+    BoardField(6, 1, False),
     # index 7
-    {"coins": 7, "victory_points": 1, "ruby": False},
+    BoardField(7, 1, False),
     # index 8
-    {"coins": 8, "victory_points": 1, "ruby": False},
+    BoardField(8, 1, False),
     # index 9
-    {"coins": 9, "victory_points": 1, "ruby": True},
+    BoardField(9, 1, True),
     # index 10
-    {"coins": 10, "victory_points": 2, "ruby": False},
+    BoardField(10, 2, False),
     # index 11
-    {"coins": 11, "victory_points": 2, "ruby": False},
+    BoardField(11, 2, False),
     # index 12
-    {"coins": 12, "victory_points": 2, "ruby": False},
+    BoardField(12, 2, False),
     # index 13
-    {"coins": 13, "victory_points": 2, "ruby": True},
+    BoardField(13, 2, True),
     # index 14
-    {"coins": 14, "victory_points": 3, "ruby": False},
+    BoardField(14, 3, False),
     # index 15
-    {"coins": 15, "victory_points": 3, "ruby": False},
+    BoardField(15, 3, False),
     # index 16
-    {"coins": 15, "victory_points": 3, "ruby": True},
+    BoardField(15, 3, True),
     # index 17
-    {"coins": 16, "victory_points": 3, "ruby": False},
+    BoardField(16, 3, False),
     # index 18
-    {"coins": 16, "victory_points": 4, "ruby": False},
+    BoardField(16, 4, False),
     # index 19
-    {"coins": 17, "victory_points": 4, "ruby": False},
+    BoardField(17, 4, False),
     # index 20
-    {"coins": 17, "victory_points": 4, "ruby": True},
+    BoardField(17, 4, True),
     # index 21
-    {"coins": 18, "victory_points": 4, "ruby": False},
+    BoardField(18, 4, False),
     # index 22
-    {"coins": 18, "victory_points": 5, "ruby": False},
+    BoardField(18, 5, False),
     # index 23
-    {"coins": 19, "victory_points": 5, "ruby": False},
+    BoardField(19, 5, False),
     # index 24
-    {"coins": 19, "victory_points": 5, "ruby": True},
+    BoardField(19, 5, True),
     # index 25
-    {"coins": 20, "victory_points": 5, "ruby": False},
+    BoardField(20, 5, False),
     # index 26
-    {"coins": 20, "victory_points": 6, "ruby": False},
+    BoardField(20, 6, False),
     # index 27
-    {"coins": 21, "victory_points": 6, "ruby": False},
+    BoardField(21, 6, False),
     # index 28
-    {"coins": 21, "victory_points": 6, "ruby": True},
+    BoardField(21, 6, True),
     # index 29
-    {"coins": 22, "victory_points": 7, "ruby": False},
+    BoardField(22, 7, False),
     # index 30
-    {"coins": 22, "victory_points": 7, "ruby": True},
+    BoardField(22, 7, True),
     # index 31
-    {"coins": 23, "victory_points": 7, "ruby": False},
+    BoardField(23, 7, False),
     # index 32
-    {"coins": 23, "victory_points": 8, "ruby": False},
+    BoardField(23, 8, False),
     # index 33
-    {"coins": 24, "victory_points": 8, "ruby": False},
+    BoardField(24, 8, False),
     # index 34
-    {"coins": 24, "victory_points": 8, "ruby": True},
+    BoardField(24, 8, True),
     # index 35
-    {"coins": 25, "victory_points": 9, "ruby": False},
+    BoardField(25, 9, False),
     # index 36
-    {"coins": 25, "victory_points": 9, "ruby": True},
+    BoardField(25, 9, True),
     # index 37
-    {"coins": 26, "victory_points": 9, "ruby": False},
-    {"coins": 26, "victory_points": 10, "ruby": False},
-    {"coins": 27, "victory_points": 10, "ruby": False},
-    {"coins": 27, "victory_points": 10, "ruby": True},
-    {"coins": 28, "victory_points": 11, "ruby": False},
-    {"coins": 28, "victory_points": 11, "ruby": True},
-    {"coins": 29, "victory_points": 11, "ruby": False},
-    {"coins": 29, "victory_points": 12, "ruby": False},
-    {"coins": 30, "victory_points": 12, "ruby": False},
-    {"coins": 30, "victory_points": 12, "ruby": True},
-    {"coins": 31, "victory_points": 12, "ruby": False},
-    {"coins": 31, "victory_points": 13, "ruby": False},
-    {"coins": 32, "victory_points": 13, "ruby": False},
-    {"coins": 32, "victory_points": 13, "ruby": True},
-    {"coins": 33, "victory_points": 14, "ruby": False},
-    {"coins": 33, "victory_points": 14, "ruby": True},
-    {"coins": 33, "victory_points": 15, "ruby": False}
+    BoardField(26, 9, False),
+    BoardField(26, 10, False),
+    BoardField(27, 10, False),
+    BoardField(27, 10, True),
+    BoardField(28, 11, False),
+    BoardField(28, 11, True),
+    BoardField(29, 11, False),
+    BoardField(29, 12, False),
+    BoardField(30, 12, False),
+    BoardField(30, 12, True),
+    BoardField(31, 12, False),
+    BoardField(31, 13, False),
+    BoardField(32, 13, False),
+    BoardField(32, 13, True),
+    BoardField(33, 14, False),
+    BoardField(33, 14, True),
+    BoardField(33, 15, False)
 ]
 
 
+# -----------------------------
+# Column views (built once from BOARD_FIELDS)
+# -----------------------------
+# Parallel per-field tuples (index = field index) for scalar lookups,
+# so reward code does not go through a dict per field.
+BOARD_COINS: Tuple[int, ...] = tuple(f.coins for f in BOARD_FIELDS)
+BOARD_VP: Tuple[int, ...] = tuple(f.victory_points for f in BOARD_FIELDS)
+BOARD_RUBY: Tuple[bool, ...] = tuple(f.ruby for f in BOARD_FIELDS)
+
+
 # -----------------------------
 # Lookup helpers
 # -----------------------------
-def get_finish_field(pot_sum: int) -> BoardFieldTD:
+def get_coins(field_index: int) -> int:
+    """Coins granted on the given field."""
+    return BOARD_COINS[field_index]
+
+
+def get_vp(field_index: int) -> int:
+    """Victory points granted on the given field."""
+    return BOARD_VP[field_index]
+
+
+def get_ruby(field_index: int) -> bool:
+    """Whether the given field grants a ruby."""
+    return BOARD_RUBY[field_index]
+
+
+def get_finish_field(pot_sum: int) -> BoardField:
     """
     Return the field where the player FINISHES.
     """
     return BOARD_FIELDS[pot_sum]
 
 
-def get_landing_field(pot_sum: int) -> BoardFieldTD:
+def get_landing_field(pot_sum: int) -> BoardField:
     """
     Return the field where the player LANDS (one field higher).
     """
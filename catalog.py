@@ -10,10 +10,8 @@ CHIPS = [{"color": "gray",      "name-DE": "Knallerbse",        "inv": {1: 23, 2
          {"color": "black",     "name-DE": "Totenkopffalter",   "inv": {1: 26}},
          {"color": "greenred",  "name-DE": "Narrenkraut",       "inv": {1: 25}}]
 
-summe = 0
-for item in CHIPS:
-    sub = sum(item['inv'].values())
-    print(f"{item['name-DE']}: {sub}")
-    summe += sub
-print(summe)
-
+if __name__ == "__main__":
+    for item in CHIPS:
+        print(f"{item['name-DE']}: {sum(item['inv'].values())}")
+    summe = sum(sum(item['inv'].values()) for item in CHIPS)
+    print(summe)
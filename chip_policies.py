@@ -21,7 +21,7 @@ All chip behavior is categorized by WHEN it triggers:
 
 Design
 ------
-- Dispatch tables keyed by chip color for now.
+- Dispatch tables keyed by chip color, flattened to tuples indexed by color code.
 - Later you can key by `type_id` if needed.
 - Policy functions mutate state only through actions.py helpers.
 
@@ -32,7 +32,7 @@ from __future__ import annotations
 
 from typing import Callable, Optional, TypedDict, Any
 
-from state import GameStateTD, ensure_player
+from state import COLOR_CODES, COLOR_NAMES, Color, GameStateTD, ensure_player
 from actions import return_chip_from_pot_to_bag
 
 
@@ -45,9 +45,9 @@ class PlacementCtx(TypedDict, total=False):
 
 
 class OnPlaceCtx(TypedDict, total=False):
-    # If you later want to pass additional knobs (e.g. allow prompts),
-    # include them here.
-    pass
+    # Player decisions are injected here so policies never block on stdin.
+    # decide_yellow(state, player_id, prev_gray_chip_id) -> remove it?
+    decide_yellow: Callable[[GameStateTD, int, str], bool]
 
 
 # -------------------------------------------------------------------
@@ -57,28 +57,52 @@ PlacementStepFn = Callable[[GameStateTD, int, str, int, PlacementCtx], int]
 OnPlaceFn = Callable[[GameStateTD, int, str, OnPlaceCtx], None]
 
 
+# -------------------------------------------------------------------
+# Color codes the rules below depend on (the catalog is fixed, so these are
+# bound once at import instead of looked up per placement)
+# -------------------------------------------------------------------
+_GRAY = Color.GRAY
+_ORANGE = Color.ORANGE
+
+
 # -------------------------------------------------------------------
 # Helpers
 # -------------------------------------------------------------------
-def _chip_color_value(state: GameStateTD, chip_id: str) -> tuple[str, int, str]:
+def _default_yes(state: GameStateTD, player_id: int, chip_id: str) -> bool:
+    """Default decision for optional effects: always take them (baseline sims)."""
+    return True
+
+
+def _chip_color_value(state: GameStateTD, chip_id: str) -> tuple[int, int]:
     """
-    Return (color, value, type_id) for a chip_id.
+    Return (color_code, value) for a chip_id.
+
+    Reads the flat per-chip tables built once by `build_pool`
+    (no chips -> chip_types walk).
     """
-    tid = state["chips"][chip_id]["type_id"]
-    ctype = state["chip_types"][tid]
-    return str(ctype["color"]), int(ctype["value"]), tid
+    return state["chip_color"][chip_id], state["chip_value"][chip_id]
 
 
 def _count_color_in_pot(state: GameStateTD, player_id: int, color: str) -> int:
     """
     Count chips of given color currently in the player's pot.
+
+    Compares integer color codes from the flat `chip_color` table
+    (one dict hit + int compare per chip).
     """
     ensure_player(state, player_id)
+    return _count_code_in_pot(state, player_id, COLOR_CODES[color])
+
+
+def _count_code_in_pot(state: GameStateTD, player_id: int, code: int) -> int:
+    """
+    Same as `_count_color_in_pot`, for rules that already hold the color code
+    (no ensure_player, no name lookup).
+    """
+    chip_color = state["chip_color"]
     cnt = 0
     for cid in state["pots"][player_id]:
-        tid = state["chips"][cid]["type_id"]
-        ctype = state["chip_types"][tid]
-        if ctype["color"] == color:
+        if chip_color[cid] == code:
             cnt += 1
     return cnt
 
@@ -107,9 +131,10 @@ def _step_red_add_oranges(
     """
     RED rule:
     Step = base red value + number of ORANGE chips already in the pot
-    (counted at the time the red chip is placed).
+    (counted at the time the red chip is placed; read from the running
+    per-color pot counts, so no pot scan).
     """
-    orange_cnt = _count_color_in_pot(state, player_id, "orange")
+    orange_cnt = state["pot_color_counts"][player_id][_ORANGE]
     return int(base_value) + int(orange_cnt)
 
 
@@ -118,6 +143,12 @@ PLACEMENT_STEP_RULES: dict[str, PlacementStepFn] = {
     # add more here later
 }
 
+# Same rules as a tuple indexed by color code (what the per-chip tables store);
+# colors without a rule get the default step.
+_PLACEMENT_STEP_TABLE: tuple[PlacementStepFn, ...] = tuple(
+    PLACEMENT_STEP_RULES.get(color, _step_default_value) for color in COLOR_NAMES
+)
+
 
 def effective_placement_step(state: GameStateTD, player_id: int, placed_chip_id: str) -> int:
     """
@@ -130,8 +161,11 @@ def effective_placement_step(state: GameStateTD, player_id: int, placed_chip_id:
     """
     ensure_player(state, player_id)
 
-    color, base_val, _tid = _chip_color_value(state, placed_chip_id)
-    fn = PLACEMENT_STEP_RULES.get(color, _step_default_value)
+    color_code, base_val = _chip_color_value(state, placed_chip_id)
+    fn = _PLACEMENT_STEP_TABLE[color_code]
+    if fn is _step_default_value:
+        # Most colors: step is the printed value, no rule call needed
+        return base_val
     return int(fn(state, player_id, placed_chip_id, base_val, {}))
 
 
@@ -152,6 +186,7 @@ def _on_place_yellow_may_remove_prev_gray(
     IMPORTANT:
     - This uses pot order, not pos_last.
     - Removal does not affect pos_last (handled by rounds.py tracker).
+    - The choice comes from ctx["decide_yellow"] (default: yes).
     """
     ensure_player(state, player_id)
 
@@ -161,14 +196,12 @@ def _on_place_yellow_may_remove_prev_gray(
 
     # placed chip is the last (just appended), so predecessor is -2
     prev_cid = pot[-2]
-    prev_color, _prev_val, _prev_tid = _chip_color_value(state, prev_cid)
-    if prev_color != "gray":
+    prev_code, _prev_val = _chip_color_value(state, prev_cid)
+    if prev_code != _GRAY:
         return
 
-    yn = input(
-        f"[Player {player_id}] Yellow after gray: remove preceding gray chip {prev_cid}? [y/n]: "
-    ).strip().lower()
-    if yn in ("y", "yes", ""):
+    decide = ctx.get("decide_yellow", _default_yes)
+    if decide(state, player_id, prev_cid):
         return_chip_from_pot_to_bag(state, player_id, prev_cid)
         # Logging is done by the caller (rounds.py) to keep policies pure-ish.
 
@@ -194,21 +227,32 @@ ON_PLACE_RULES: dict[str, OnPlaceFn] = {
     # add more here later (greenred etc.)
 }
 
+# Same rules as a tuple indexed by color code (None = no on-place effect).
+_ON_PLACE_TABLE: tuple[Optional[OnPlaceFn], ...] = tuple(
+    ON_PLACE_RULES.get(color) for color in COLOR_NAMES
+)
+
 
-def apply_on_place_effects(state: GameStateTD, player_id: int, placed_chip_id: str) -> None:
+def apply_on_place_effects(
+    state: GameStateTD,
+    player_id: int,
+    placed_chip_id: str,
+    ctx: Optional[OnPlaceCtx] = None,
+) -> None:
     """
     Apply immediate effects caused by placing this chip during the drawing phase.
 
     Entry point used by `phase_drawing` right after PALM->POT and pos_last update.
+    `ctx` carries the player-decision callbacks (see OnPlaceCtx).
     """
     ensure_player(state, player_id)
 
-    color, _base_val, _tid = _chip_color_value(state, placed_chip_id)
-    fn = ON_PLACE_RULES.get(color)
-    if not fn:
+    color_code, _base_val = _chip_color_value(state, placed_chip_id)
+    fn = _ON_PLACE_TABLE[color_code]
+    if fn is None:
         return
 
-    fn(state, player_id, placed_chip_id, {})
+    fn(state, player_id, placed_chip_id, ctx if ctx is not None else {})
 
 
 # -------------------------------------------------------------------
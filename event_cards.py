@@ -8,210 +8,205 @@ Each card has a color:
 - blue: active modifier for the duration of the round (end phases)
 
 This module defines structure + deck data (no effect mechanics yet).
+Display text (titles, descriptions) lives in event_cards_text.py.
+Staged cards that are not in play yet live in event_cards_draft.json (see load_draft).
 
 by Sziller
 """
 
 from __future__ import annotations
 
-from typing import Literal, Optional, TypedDict, List
+import dataclasses
+import functools
+import json
+import random
+import sys
+from dataclasses import dataclass, field
+from enum import IntEnum
+from pathlib import Path
+from types import MappingProxyType
+from typing import Final, Mapping, Optional, Tuple
 
 
-EventColor = Literal["blue", "purple"]
-EventScope = Literal["global", "per_player"]
+class EventColor(IntEnum):
+    BLUE = 0
+    PURPLE = 1
 
+    @property
+    def label(self) -> str:
+        """Display name, e.g. "purple"."""
+        return self.name.lower()
 
-class EventCardTD(TypedDict, total=False):
+
+class EventScope(IntEnum):
+    GLOBAL = 0
+    PER_PLAYER = 1
+
+    @property
+    def label(self) -> str:
+        """Display name, e.g. "per_player"."""
+        return self.name.lower()
+
+
+# Integer ids for dispatch tables keyed by card (EventID.EV12 == 12).
+# card_id strings stay for display/logging.
+EventID = IntEnum("EventID", {f"EV{n:02d}": n for n in range(1, 26)})
+
+
+@dataclass(frozen=True, slots=True)
+class EventCard:
     # Stable unique identifier for the card (never change once adopted)
     card_id: str
 
-    # Display metadata
-    title: str
     color: EventColor
-    description: str
 
     # Placeholder for future effect dispatch
-    effect_id: Optional[str]
+    effect_id: Optional[str] = None
 
     # For PURPLE cards only: whether the immediate action is resolved globally or per player.
     # Blue cards can omit this.
-    scope: Optional[EventScope]
+    scope: Optional[EventScope] = None
+
+    # Derived from card_id in __post_init__ (int key for the rule tables)
+    event_id: EventID = field(init=False, compare=False)
+
+    def __post_init__(self) -> None:
+        object.__setattr__(self, "event_id", EventID[self.card_id])
+
+        # Intern the string keys compared all over the engine, so equality against
+        # literals hits the identity fast path (also for cards loaded from data files).
+        for name in ("card_id", "effect_id"):
+            value = getattr(self, name)
+            if value is not None:
+                object.__setattr__(self, name, sys.intern(value))
 
 
 # ---------------------------------------------------------------------
 # Authoritative deck (as provided by you) with stable IDs assigned here
 # ---------------------------------------------------------------------
-EVENT_DECK: List[EventCardTD] = [
-    # {
-    #     "card_id": "EV01",
-    #     "color": "purple",
-    #     "title": "A good start",
-    #     "description": "Choose: Use your rat stone normally OR pass up on 1-3 rat tails and take 1-3 rubies instead",
-    #     "scope": "per_player"
-    # },
-    # {
-    #     "card_id": "EV02",
-    #     "color": "purple",
-    #     "title": "The pot is filling up",
-    #     "description": "Move your droplet 1 space forward",
-    #     "scope": "global"
-    # },
-    # {
-    #     "card_id": "EV03",
-    #     "color": "purple",
-    #     "title": "Donations",
-    #     "description": "Everyone rolls the die once and receives a bonus accordingly",
-    #     "scope": "per_player"
-    # },
-    # {
-    #     "card_id": "EV04",
-    #     "color": "purple",
-    #     "title": "Wheel and deal",
-    #     "description": "You can trade 1 ruby for any one 1-chip (not purple or black)",
-    #     "scope": "per_player"
-    # },
-    # {
-    #     "card_id": "EV05",
-    #     "color": "purple",
-    #     "title": "Less is more",
-    #     "description": "All players draw 5 chips. The player(s) with the lowest sum get(s) to take 1 blue 2-chip."
-    #                    "All other players receive 1 ruby. Then, put all the chips back in the bag!",
-    #     "scope": "per_player"
-    # },
-    # {
-    #     "card_id": "EV06",
-    #     "color": "purple",
-    #     "title": "An opportunistic moment",
-    #     "description": "Draw 4 chips from your bag. You can trade in one of them for the chip of the same color,"
-    #                    "with the next highest value. Take one green 1-chip, if you can't make a trade."
-    #                    "Then, put all the chips back in the bag!",
-    #     "scope": "per_player"
-    # },
-    # {
-    #     "card_id": "EV07",
-    #     "color": "purple",
-    #     "title": "Beginner’s bonus",
-    #     "description": "The player(s) with the fewest victory points receive(s) one green 1-chip.",
-    #     "scope": "global"
-    # },
-    # {
-    #     "card_id": "EV08",
-    #     "color": "purple",
-    #     "title": "Just in time",
-    #     "description": "Choose: Take 4 victory points OR remove one white 1-chip from your bag.",
-    #     "scope": "per_player"
-    # },
-    # {
-    #     "card_id": "EV09",
-    #     "color": "purple",
-    #     "title": "But you only get to choose one",
-    #     "description": "Choose: Take 1 black chip OR any one 2-chip OR 3 rubies.",
-    #     "scope": "per_player"
-    # },
-    # {
-    #     "card_id": "EV10",
-    #     "color": "blue",
-    #     "title": "Rat infestation",
-    #     "description": "Double the number of rat tails in this round.",
-    #     "scope": "per_player"
-    # },
-    # {
-    #     "card_id": "EV11",
-    #     "color": "purple",
-    #     "title": "Rats are your friends",
-    #     "description": "Choose: Take any one 4-chip OR 1 victory point for each rat tail you will receive.",
-    #     "scope": "per_player"
-    # },
-    {
-        "card_id": "EV12",
-        "color": "purple",
-        "title": "Alms",
-        "description": "The player(s) with the fewest rubies receive(s) 1 ruby.",
-        "scope": "global"
-    },
-    {
-        "card_id": "EV13",
-        "color": "purple",
-        "title": "Choose wisely - I.",
-        "description": "Choose: Move your droplet 2 spaces forward OR take 1 purple chip.",
-        "scope": "per_player"
-    },
-    {
-        "card_id": "EV14",
-        "color": "purple",
-        "title": "Choose wisely - II.",
-        "description": "Choose: Move your droplet 2 spaces forward OR take 1 purple chip.",
-        "scope": "per_player"
-    },
-    # {
-    #     "card_id": "EV15",
-    #     "color": "blue",
-    #     "title": "Well stirred",
-    #     "description": "In this round, you get to put the first white chip you draw back into the bag."
-    # },
-    # {
-    #     "card_id": "EV16",
-    #     "color": "blue",
-    #     "title": "Strong ingredient",
-    #     "description": "Beginning with the start player: If you stopped without an explosion,"
-    #                    "draw up to 5 chips from your bag and place 1 of them in your pot."
-    # },
-    # {
-    #     "card_id": "EV17",
-    #     "color": "blue",
-    #     "title": "A second chance",
-    #     "description": "After the first 5 chips have landed in your pot, choose: Continue OR begin the round all over"
-    #                    "again – possible only once (1x)."
-    # },
-    # {
-    #     "card_id": "EV18",
-    #     "color": "blue",
-    #     "title": "Seasoned perfectly",
-    #     "description": "If your white chips total exactly 7 at the end of the round, you get to move your droplet"
-    #                    "1 field forward."
-    # },
-    # {
-    #     "card_id": "EV19",
-    #     "color": "blue",
-    #     "title": "Magic potion",
-    #     "description": "At the end of the round, all the flasks get a free refill."
-    # },
-    # {
-    #     "card_id": "EV20",
-    #     "color": "blue",
-    #     "title": "Living in luxury",
-    #     "description": "The threshold for white chips is raised in this round from 7 to 9."
-    # },
-    # {
-    #     "card_id": "EV21",
-    #     "color": "blue",
-    #     "title": "Malicious joy",
-    #     "description": "If your pot explodes in this round, the player to your left gets any one 2-chip."
-    # },
-    # {
-    #     "card_id": "EV22",
-    #     "color": "blue",
-    #     "title": "Pumpkin patch party",
-    #     "description": "In this round, every orange chip is moved 1 extra space forward."
-    # },
-    # {
-    #     "card_id": "EV23",
-    #     "color": "blue",
-    #     "title": "Lucky devil",
-    #     "description": "Regardless if your pot has exploded or not:"
-    #                    "If you reach a scoring field with a ruby in this round, you get an extra 2 victory points."
-    # },
-    # {
-    #     "card_id": "EV24",
-    #     "color": "blue",
-    #     "title": "The pot is full",
-    #     "description": "The player(s) who get(s) to roll the die in this round roll(s) twice (2x)."
-    # },
-    # {
-    #     "card_id": "EV25",
-    #     "color": "blue",
-    #     "title": "Shining extra bright",
-    #     "description": "If you reach a scoring field with a ruby in this round, you get an extra ruby.",
-    # }
-]
+# Titles/descriptions are display-only and live in event_cards_text.py.
+EVENT_DECK: Final[Tuple[EventCard, ...]] = (
+    EventCard(
+        card_id="EV12",
+        color=EventColor.PURPLE,
+        scope=EventScope.GLOBAL,
+    ),
+    EventCard(
+        card_id="EV13",
+        color=EventColor.PURPLE,
+        scope=EventScope.PER_PLAYER,
+    ),
+    EventCard(
+        card_id="EV14",
+        color=EventColor.PURPLE,
+        scope=EventScope.PER_PLAYER,
+    ),
+)
+
+
+# Per-card color codes (index = deck position), for scans over the deck
+DECK_COLORS: Final[Tuple[EventColor, ...]] = tuple(c.color for c in EVENT_DECK)
+BLUE_INDICES: Final[Tuple[int, ...]] = tuple(i for i, col in enumerate(DECK_COLORS) if col == EventColor.BLUE)
+
+# Precomputed views (the deck never changes after import; all read-only,
+# so one copy can be shared across threads / worker processes)
+BY_ID: Final[Mapping[str, EventCard]] = MappingProxyType({c.card_id: c for c in EVENT_DECK})
+PURPLE_DECK: Final[Tuple[EventCard, ...]] = tuple(c for c in EVENT_DECK if c.color == EventColor.PURPLE)
+BLUE_DECK: Final[Tuple[EventCard, ...]] = tuple(c for c in EVENT_DECK if c.color == EventColor.BLUE)
+
+
+@functools.lru_cache(maxsize=None)
+def _event_card_fields() -> Tuple[str, ...]:
+    """Constructor field names of EventCard (introspected once, then cached)."""
+    return tuple(f.name for f in dataclasses.fields(EventCard) if f.init)
+
+
+# ---------------------------------------------------------------------
+# Sampling helpers
+# ---------------------------------------------------------------------
+def _floyd_sample(n: int, k: int, rng: random.Random) -> list[int]:
+    """
+    Floyd's algorithm: k distinct indices from range(n) in O(k) time and memory
+    (no full permutation is built).
+    """
+    chosen: set[int] = set()
+    picks: list[int] = []
+    for j in range(n - k, n):
+        t = rng.randrange(j + 1)
+        pick = j if t in chosen else t
+        chosen.add(pick)
+        picks.append(pick)
+    return picks
+
+
+def draw_without_replacement(k: int, rng: Optional[random.Random] = None) -> Tuple[EventCard, ...]:
+    """
+    Draw `k` distinct cards from EVENT_DECK (uniformly, without replacement).
+    The SET of cards is uniform; their order in the result is not shuffled.
+    Raises ValueError if k exceeds the deck size.
+    """
+    n = len(EVENT_DECK)
+    if not 0 <= k <= n:
+        raise ValueError(f"Cannot draw {k} cards from a deck of {n}")
+
+    rng = rng or random
+    return tuple(EVENT_DECK[i] for i in _floyd_sample(n, k, rng))
+
+
+def draw_many(k: int, n_players: int, rng: Optional[random.Random] = None) -> Tuple[Tuple[int, ...], ...]:
+    """
+    Independent draws for several players at once: row p holds `k` distinct
+    EVENT_DECK indices for player p (each row drawn without replacement).
+
+    One call resolves the RNG and validates once; rows reuse the Floyd sampler.
+    """
+    n = len(EVENT_DECK)
+    if not 0 <= k <= n:
+        raise ValueError(f"Cannot draw {k} cards from a deck of {n}")
+
+    rng = rng or random
+    return tuple(tuple(_floyd_sample(n, k, rng)) for _ in range(n_players))
+
+
+def shuffled_deck(rng: Optional[random.Random] = None) -> Tuple[EventCard, ...]:
+    """
+    Return EVENT_DECK in a uniformly random order.
+
+    Delegates to `rng.sample`, the C-coded, unbiased Fisher-Yates/Durstenfeld
+    shuffle, so no hand-written swap loop (and its off-by-one pitfalls) is needed.
+    """
+    rng = rng or random
+    return tuple(rng.sample(EVENT_DECK, len(EVENT_DECK)))
+
+
+# ---------------------------------------------------------------------
+# Draft cards (not in play yet) live in event_cards_draft.json
+# ---------------------------------------------------------------------
+DRAFT_PATH = Path(__file__).with_name("event_cards_draft.json")
+_DRAFT_TEXT_KEYS = ("title", "description")   # read by event_cards_text.load_draft_text
+
+
+def load_draft() -> Tuple[EventCard, ...]:
+    """
+    Load the staged (inactive) cards from event_cards_draft.json.
+    Read on demand only; the game itself never needs them.
+    Their display text is loaded separately (event_cards_text.load_draft_text).
+    """
+    with DRAFT_PATH.open(encoding="utf-8") as f:
+        rows = json.load(f)
+
+    fields = _event_card_fields()
+    for row in rows:
+        unknown = [k for k in row if k not in fields and k not in _DRAFT_TEXT_KEYS]
+        if unknown:
+            raise ValueError(f"Unknown event card field(s) in draft {row.get('card_id', '?')}: {unknown}")
 
+    return tuple(
+        EventCard(
+            card_id=row["card_id"],
+            color=EventColor[row["color"].upper()],
+            effect_id=row.get("effect_id"),
+            scope=EventScope[row["scope"].upper()] if row.get("scope") else None,
+        )
+        for row in rows
+    )
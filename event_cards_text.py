@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""
+event_cards_text.py — Display text for event cards (Quacks)
+
+Titles and rulebook descriptions, keyed by card_id.
+Kept apart from event_cards.py so the engine's card objects stay small;
+only code that shows cards to players needs this module.
+
+by Sziller
+"""
+
+from __future__ import annotations
+
+import json
+from typing import Dict, Tuple
+
+from event_cards import DRAFT_PATH
+
+
+# card_id -> (title, description)
+CARD_TEXT: Dict[str, Tuple[str, str]] = {
+    "EV12": (
+        "Alms",
+        "The player(s) with the fewest rubies receive(s) 1 ruby.",
+    ),
+    "EV13": (
+        "Choose wisely - I.",
+        "Choose: Move your droplet 2 spaces forward OR take 1 purple chip.",
+    ),
+    "EV14": (
+        "Choose wisely - II.",
+        "Choose: Move your droplet 2 spaces forward OR take 1 purple chip.",
+    ),
+}
+
+
+def card_title(card_id: str) -> str:
+    """Return the card title, or "" if unknown."""
+    return CARD_TEXT.get(card_id, ("", ""))[0]
+
+
+def card_description(card_id: str) -> str:
+    """Return the card description, or "" if unknown."""
+    return CARD_TEXT.get(card_id, ("", ""))[1]
+
+
+def load_draft_text() -> Dict[str, Tuple[str, str]]:
+    """
+    Load (title, description) for the staged cards in event_cards_draft.json.
+    """
+    with DRAFT_PATH.open(encoding="utf-8") as f:
+        rows = json.load(f)
+    return {row["card_id"]: (row.get("title", ""), row.get("description", "")) for row in rows}
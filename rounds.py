@@ -21,23 +21,97 @@ by Sziller
 
 from __future__ import annotations
 
+import itertools
 import random
+from dataclasses import dataclass
 from typing import Callable, List, Optional, Literal
 
-from actions import pot_sums
-from board import BOARD_FIELDS
-from event_cards import EVENT_DECK
-from state import GameStateTD, ensure_player, clear_round_ctx
-from chip_policies import effective_placement_step, apply_on_place_effects
+from actions import (
+    draw_n_from_bag_to_palm,
+    place_one_and_flush_palm,
+    pot_sums,
+    return_all_palm_to_bag,
+    return_all_pot_to_bag,
+    return_chip_from_pot_to_bag,
+    take_any_chip_of_color_from_box_to_bag,
+)
+from board import BOARD_COINS, BOARD_RUBY, BOARD_VP
+from event_cards import EventCard, EventColor, EventID, EventScope, shuffled_deck
+from event_cards_text import card_description, card_title
+from state import COLOR_NAMES, Color, GameStateTD, PlayerState, ensure_player, clear_round_ctx
+from chip_policies import OnPlaceCtx, effective_placement_step, apply_on_place_effects
+
+# Player ids are fixed for a whole game: frozen once in run_game (state["player_ids"])
+# and passed to every phase/handler as this tuple.
+PlayerIds = tuple[int, ...]
 
 
 # -----------------------------
 # Small infrastructure helpers
 # -----------------------------
-def broadcast(state: GameStateTD, msg: str) -> None:
-    """Public, transparent message to all players + stored centrally."""
+def broadcast(state: GameStateTD, msg: str, *args: object) -> None:
+    """
+    Public, transparent message to all players + stored centrally (or streamed to the log sink).
+
+    `msg` may be a %-format with `args`; it is only formatted when logging is on,
+    so headless runs with state["log_enabled"] = False skip the string work.
+    """
+    if not state["log_enabled"]:
+        return
+    if args:
+        msg = msg % args
     print(msg)
-    state["public_log"].append(msg)
+    sink = state.get("public_log_sink")
+    if sink is not None:
+        sink.write(msg + "\n")
+    else:
+        state["public_log"].append(msg)
+        state["public_log_seq"] += 1
+
+
+def broadcast_block(state: GameStateTD, lines: List[str]) -> None:
+    """Same as `broadcast` for several consecutive lines: one print, one log extend."""
+    if not state["log_enabled"]:
+        return
+    joined = "\n".join(lines)
+    print(joined)
+    sink = state.get("public_log_sink")
+    if sink is not None:
+        sink.write(joined + "\n")
+    else:
+        state["public_log"].extend(lines)
+        state["public_log_seq"] += len(lines)
+
+
+def drain_broadcast(state: GameStateTD, pid: int) -> List[str]:
+    """
+    Return the public log entries player `pid` has not read yet and advance
+    their cursor. All players share the one log; only the cursors are per player.
+
+    Cursors are absolute sequence numbers, so entries already dropped from the
+    bounded log (or streamed to the sink) are simply skipped.
+    """
+    log = state["public_log"]
+    end = state["public_log_seq"]
+    first = end - len(log)           # sequence number of log[0]
+    cursors = state["log_cursors"]
+    start = max(cursors.get(pid, 0), first)
+    cursors[pid] = end
+    return list(itertools.islice(log, start - first, None))
+
+
+def trim_broadcast_log(state: GameStateTD) -> None:
+    """
+    Drop log entries every draining player has already read.
+    No-op while nobody drains (the full log is kept, as before).
+    """
+    cursors = state["log_cursors"]
+    if not cursors:
+        return
+    log = state["public_log"]
+    first = state["public_log_seq"] - len(log)
+    for _ in range(min(cursors.values()) - first):
+        log.popleft()
 
 def _fmt_cell(val: object, width: int, align: str = "left") -> str:
     s = str(val)
@@ -50,141 +124,206 @@ def _fmt_cell(val: object, width: int, align: str = "left") -> str:
     return s.ljust(width)
 
 
-def broadcast_player_table(state: GameStateTD, player_ids: List[int], *, title: str = "PLAYER STATE") -> None:
+# Player table layout: (label, width, align). Column formats are compiled once.
+_TABLE_HEADERS = [
+    ("PID", 3, "right"),
+    ("VP", 4, "right"),
+    ("Coins", 6, "right"),
+    ("Rubies", 6, "right"),
+    ("Droplet", 7, "right"),
+    ("Potion", 6, "center"),   # NEW
+    ("Bag", 4, "right"),
+    ("Palm", 5, "right"),
+    ("Pot", 4, "right"),
+    ("Desktop", 7, "right"),
+]
+_ALIGN_SPEC = {"left": "<", "right": ">", "center": "^"}
+_TABLE_ROW_FMT = " | ".join("{:%s%d}" % (_ALIGN_SPEC[a], w) for (_, w, a) in _TABLE_HEADERS)
+_TABLE_HEADER_LINE = " | ".join(_fmt_cell(h, w, "center") for (h, w, _) in _TABLE_HEADERS)
+_TABLE_RULE_LINE = "-+-".join("-" * w for (_, w, _) in _TABLE_HEADERS)
+
+
+def broadcast_player_table(state: GameStateTD, player_ids: PlayerIds, *, title: str = "PLAYER STATE") -> None:
     """
     Print a compact table of per-player state at the beginning of each round/turn.
 
     This is display-only. No mutations.
+    All cells are short ints or "FULL"/"EMPTY", so rows are one str.format
+    call with the precompiled _TABLE_ROW_FMT (no per-cell truncation needed).
     """
     # Ensure players exist so table never crashes during early setup
     for pid in player_ids:
         ensure_player(state, pid)
 
-    # Columns you likely care about for testing
-    headers = [
-        ("PID", 3, "right"),
-        ("VP", 4, "right"),
-        ("Coins", 6, "right"),
-        ("Rubies", 6, "right"),
-        ("Droplet", 7, "right"),
-        ("Potion", 6, "center"),   # NEW
-        ("Bag", 4, "right"),
-        ("Palm", 5, "right"),
-        ("Pot", 4, "right"),
-        ("Desktop", 7, "right"),
-    ]
-
-    # Read counts safely even if you haven't added desktop everywhere yet
-    def _desktop_len(pid: int) -> int:
-        # if you later add state["desktops"][pid], this will show it
-        desks = state.get("desktops")  # type: ignore[typeddict-item]
-        if isinstance(desks, dict):
-            return len(desks.get(pid, []))
-        return 0
-
-    def _potion_str(pid: int) -> str:
-        ps = state["players"][pid]
-        filled = bool(ps.get("potion_filled", True))  # default True for robustness
-        return "FULL" if filled else "EMPTY"
-
-    # Build table lines
-    sep = " | "
-    header_line = sep.join(_fmt_cell(h, w, "center") for (h, w, _) in headers)
-    rule_line = "-+-".join("-" * w for (_, w, _) in headers)
+    # Bind the per-player containers once (desktops may be missing in old states)
+    players = state["players"]
+    bags = state["bags"]
+    palms = state.get("palms", {})
+    pots = state["pots"]
+    desks = state.get("desktops")  # type: ignore[typeddict-item]
+    if not isinstance(desks, dict):
+        desks = {}
 
     rows: List[str] = []
     for pid in player_ids:
-        ps = state["players"][pid]
-        row_vals = [
+        ps = players[pid]
+        potion = "FULL" if ps.potion_filled else "EMPTY"
+        rows.append(_TABLE_ROW_FMT.format(
             pid,
-            ps.get("victory_points", 0),
-            ps.get("coins", 0),
-            ps.get("rubies", 0),
-            ps.get("droplet_pos", 0),
-            _potion_str(pid),                  # NEW
-            len(state["bags"].get(pid, [])),
-            len(state.get("palms", {}).get(pid, [])),
-            len(state["pots"].get(pid, [])),
-            _desktop_len(pid),
-        ]
-        row = sep.join(_fmt_cell(v, w, a) for (v, (_, w, a)) in zip(row_vals, headers))
-        rows.append(row)
-
-    broadcast(state, f"\n[{title}]")
-    broadcast(state, header_line)
-    broadcast(state, rule_line)
-    for r in rows:
-        broadcast(state, r)
-
-
-
-def confirm_all_players(state: GameStateTD, player_ids: List[int], prompt: str) -> None:
+            ps.victory_points,
+            ps.coins,
+            ps.rubies,
+            ps.droplet_pos,
+            potion,                            # NEW
+            len(bags.get(pid, ())),
+            len(palms.get(pid, ())),
+            len(pots.get(pid, ())),
+            len(desks.get(pid, ())),
+        ))
+
+    broadcast_block(state, [f"\n[{title}]", _TABLE_HEADER_LINE, _TABLE_RULE_LINE, *rows])
+
+
+
+class ConsoleIO:
+    """
+    Default player-input provider: one blocking stdin read per prompt.
+
+    Any object with the same two methods can be installed as state["io"]
+    (scripted bots/tests, a server front-end that collects answers itself).
+    """
+    __slots__ = ()
+
+    def prompt(self, pid: int, msg: str, default: str) -> str:
+        return input(msg)
+
+    def prompt_all(self, player_ids: PlayerIds, msg_for: Callable[[int], str], default: str) -> dict[int, str]:
+        """Ask every player the same question; providers may fan this out concurrently."""
+        return {pid: self.prompt(pid, msg_for(pid), default) for pid in player_ids}
+
+
+CONSOLE_IO = ConsoleIO()
+
+
+def _prompt(state: GameStateTD, pid: int, msg: str, default: str, *args: object) -> str:
+    """
+    Read one line of input from player `pid` through the state["io"] provider
+    (console if unset).
+
+    With state["auto_mode"] set (batch simulations / test harnesses) nothing is
+    read: `default` is returned as if the player had typed it. Like `broadcast`,
+    `msg` may be a %-format with `args`, formatted only when a prompt is shown.
+    """
+    if state.get("auto_mode"):
+        return default
+    if args:
+        msg = msg % args
+    return (state.get("io") or CONSOLE_IO).prompt(pid, msg, default)
+
+
+def _prompt_all(state: GameStateTD, player_ids: PlayerIds, msg_for: Callable[[int], str], default: str) -> dict[int, str]:
+    """Same as `_prompt`, for one question put to every player: {pid: answer}."""
+    if state.get("auto_mode"):
+        return dict.fromkeys(player_ids, default)
+    return (state.get("io") or CONSOLE_IO).prompt_all(player_ids, msg_for, default)
+
+
+def _tell(state: GameStateTD, msg: str) -> None:
+    """
+    Console-only hint for the player at the keyboard (input menus, retry
+    messages). Not logged; skipped in auto_mode and with logging off, where
+    nobody is typing or reading.
+    """
+    if state.get("auto_mode") or not state["log_enabled"]:
+        return
+    print(msg)
+
+
+def confirm_all_players(state: GameStateTD, player_ids: PlayerIds, prompt: str) -> None:
     """
     Unanimous confirmation gate.
-    For now: sequential prompts in terminal.
+    For now: sequential prompts in terminal (skipped entirely in auto_mode).
     """
     broadcast(state, f"\n[CONFIRM-ALL] {prompt}")
+    if state.get("auto_mode"):
+        return
     for pid in player_ids:
         while True:
-            ans = input(f"Player {pid} confirm? [y]: ").strip().lower()
+            ans = _prompt(state, pid, f"Player {pid} confirm? [y]: ", "y").strip().lower()
             if ans in ("y", "yes", ""):
                 break
-            print("Please confirm with 'y' (or just press Enter).")
+            _tell(state, "Please confirm with 'y' (or just press Enter).")
 
 
-def landing_rewards_for_total_sum(total_sum: int) -> tuple[int, int, bool, int]:
+def cli_decide_yellow(state: GameStateTD, pid: int, prev_cid: str) -> bool:
     """
-    Uses BOARD_FIELDS list. If incomplete, clamps to last field or returns zeros if empty.
-    Returns: (coins, vp, ruby, landing_index)
+    CLI decision for the YELLOW on-place rule (chip_policies OnPlaceCtx.decide_yellow).
     """
-    landing_index = total_sum + 1
+    yn = _prompt(
+        state,
+        pid,
+        f"[Player {pid}] Yellow after gray: remove preceding gray chip {prev_cid}? [y/n]: ",
+        "y",
+    ).strip().lower()
+    return yn in ("y", "yes", "")
 
-    if not BOARD_FIELDS:
-        return 0, 0, False, landing_index
 
-    if landing_index < 0:
-        landing_index = 0
-    if landing_index >= len(BOARD_FIELDS):
-        landing_index = len(BOARD_FIELDS) - 1
+CLI_ON_PLACE_CTX: OnPlaceCtx = {"decide_yellow": cli_decide_yellow}
 
-    f = BOARD_FIELDS[landing_index]
-    return int(f["coins"]), int(f["victory_points"]), bool(f["ruby"]), landing_index
 
-def count_color_in_pot(state: GameStateTD, pid: int, color: str) -> int:
-    cnt = 0
-    for cid in state["pots"][pid]:
-        tid = state["chips"][cid]["type_id"]
-        ctype = state["chip_types"][tid]
-        if ctype["color"] == color:
-            cnt += 1
-    return cnt
+# Landing result per board field, exactly as landing_rewards_for_position returns
+# it: (coins, vp, ruby, landing_index), index = field.
+_LANDING_TABLE: tuple[tuple[int, int, bool, int], ...] = tuple(
+    (coins, vp, ruby, i) for i, (coins, vp, ruby) in enumerate(zip(BOARD_COINS, BOARD_VP, BOARD_RUBY))
+)
+_LANDING_MAX = len(_LANDING_TABLE) - 1
 
 
-def effective_placement_step(state: GameStateTD, pid: int, chip_id: str) -> int:
+def landing_rewards_for_position(pos: int) -> tuple[int, int, bool, int]:
     """
-    Return how many fields the freshly drawn chip advances the last position.
-
-    Default: chip value
-    Example rule (prototype per your description):
-    - Red chips: advance = base_value + (#orange chips already in pot at draw time)
+    Rewards of the field at board position `pos` (clamped to the board).
+    Returns: (coins, vp, ruby, landing_index)
     """
-    tid = state["chips"][chip_id]["type_id"]
-    ctype = state["chip_types"][tid]
-    base = int(ctype["value"])
-    color = ctype["color"]
+    if _LANDING_MAX < 0:
+        # Board not filled in yet: no rewards anywhere
+        return 0, 0, False, pos
 
-    if color == "red":
-        orange_cnt = count_color_in_pot(state, pid, "orange")
-        return base + orange_cnt
+    return _LANDING_TABLE[0 if pos < 0 else (_LANDING_MAX if pos > _LANDING_MAX else pos)]
 
-    return base
 
+def landing_rewards_for_total_sum(total_sum: int) -> tuple[int, int, bool, int]:
+    """
+    Landing field is total_sum + 1. If the board is incomplete, clamps to last field
+    or returns zeros if empty.
+    Returns: (coins, vp, ruby, landing_index)
+    """
+    return landing_rewards_for_position(total_sum + 1)
 
 # -----------------------------
 # Blue event dispatch tables
 # -----------------------------
-PurpleEffectFn = Callable[[GameStateTD, dict, List[int], random.Random], None]
-PURPLE_EFFECTS: dict[str, PurpleEffectFn] = {}
+PurpleEffectFn = Callable[[GameStateTD, EventCard, PlayerIds, random.Random], None]
+PURPLE_EFFECTS: dict[int, PurpleEffectFn] = {}   # keyed by EventID
+
+
+# -----------------------------
+# Drawing results
+# -----------------------------
+@dataclass(slots=True)
+class DrawResult:
+    """One player's drawing-phase outcome (round_ctx["drawing_results"][pid])."""
+    droplet_pos: int
+    rat_tails: int
+    pos_start: int
+    pos_last: int
+    gray_sum: int
+    chip_sum: int
+    exploded: bool
+    landing_index: int
+    landing_coins: int
+    landing_vp: int
+    landing_ruby: bool
+
 
 # Context types: tiny “parameter bags” passed to handlers
 class DrawContext:
@@ -212,24 +351,24 @@ class ScoreContext:
 
 
 # Handler signatures
-BlueDrawRuleFn = Callable[[GameStateTD, dict, DrawContext], int]
-BlueRubiesRuleFn = Callable[[GameStateTD, dict, int, RubiesContext], int]
-BlueScoreRuleFn = Callable[[GameStateTD, dict, int, ScoreContext], tuple[int, int]]
+BlueDrawRuleFn = Callable[[GameStateTD, EventCard, DrawContext], int]
+BlueRubiesRuleFn = Callable[[GameStateTD, EventCard, int, RubiesContext], int]
+BlueScoreRuleFn = Callable[[GameStateTD, EventCard, int, ScoreContext], tuple[int, int]]
 
 
-def _blue_draw_ev20_living_in_luxury(state: GameStateTD, card: dict, ctx: DrawContext) -> int:
+def _blue_draw_ev20_living_in_luxury(state: GameStateTD, card: EventCard, ctx: DrawContext) -> int:
     # EV20: threshold for white chips raised from 7 to 9 (we map this to explosion limit in current prototype)
     return 9
 
 
-def _blue_rubies_ev14_shining_extra_bright(state: GameStateTD, card: dict, pid: int, ctx: RubiesContext) -> int:
+def _blue_rubies_ev14_shining_extra_bright(state: GameStateTD, card: EventCard, pid: int, ctx: RubiesContext) -> int:
     # EV14: if you reach a scoring field with a ruby -> extra ruby
     if ctx.landed_on_ruby:
         return ctx.base_ruby_gain + 1
     return ctx.base_ruby_gain
 
 
-def _blue_score_ev23_lucky_devil(state: GameStateTD, card: dict, pid: int, ctx: ScoreContext) -> tuple[int, int]:
+def _blue_score_ev23_lucky_devil(state: GameStateTD, card: EventCard, pid: int, ctx: ScoreContext) -> tuple[int, int]:
     # EV23: if you reach a scoring field with a ruby -> extra 2 victory points
     add_coins = ctx.add_coins
     add_vp = ctx.add_vp + (2 if ctx.landed_on_ruby else 0)
@@ -237,42 +376,50 @@ def _blue_score_ev23_lucky_devil(state: GameStateTD, card: dict, pid: int, ctx:
 
 
 # Dispatch tables (card_id -> handler)
-BLUE_DRAW_RULES: dict[str, BlueDrawRuleFn] = {
-    "EV20": _blue_draw_ev20_living_in_luxury,
+BLUE_DRAW_RULES: dict[int, BlueDrawRuleFn] = {
+    EventID.EV20: _blue_draw_ev20_living_in_luxury,
 }
 
-BLUE_RUBIES_RULES: dict[str, BlueRubiesRuleFn] = {
-    "EV14": _blue_rubies_ev14_shining_extra_bright,
+BLUE_RUBIES_RULES: dict[int, BlueRubiesRuleFn] = {
+    EventID.EV14: _blue_rubies_ev14_shining_extra_bright,
 }
 
-BLUE_SCORE_RULES: dict[str, BlueScoreRuleFn] = {
-    "EV23": _blue_score_ev23_lucky_devil,
+BLUE_SCORE_RULES: dict[int, BlueScoreRuleFn] = {
+    EventID.EV23: _blue_score_ev23_lucky_devil,
 }
 
 
-def get_active_blue_card(state: GameStateTD) -> Optional[dict]:
-    """Return active blue card dict, if any and if it is blue."""
+def get_active_blue_card(state: GameStateTD) -> Optional[EventCard]:
+    """Return active blue card, if any and if it is blue."""
     card = state.get("active_blue_event")
     if not card:
         return None
-    if card.get("color") != "blue":
+    if card.color != EventColor.BLUE:
         return None
     return card
 
 
+def _active_blue_handler(state: GameStateTD, table: dict[int, Callable]) -> tuple[Optional[Callable], Optional[EventCard]]:
+    """
+    Resolve the handler for the active blue card in one of the BLUE_*_RULES tables.
+    Returns (fn, card), or (None, None) if no blue card is active or it has no rule here.
+    """
+    event_id = state.get("active_blue_card_id")
+    if event_id is None:
+        return None, None
+    fn = table.get(event_id)
+    if fn is None:
+        return None, None
+    return fn, state["active_blue_event"]
+
+
 def apply_blue_draw_rule(state: GameStateTD, default_gray_limit: int) -> int:
     """
     Return effective draw explosion limit, possibly modified by active blue card.
     """
-    card = get_active_blue_card(state)
-    if not card:
+    fn, card = _active_blue_handler(state, BLUE_DRAW_RULES)
+    if fn is None:
         return default_gray_limit
-
-    card_id = card.get("card_id", "")
-    fn = BLUE_DRAW_RULES.get(card_id)
-    if not fn:
-        return default_gray_limit
-
     return fn(state, card, DrawContext(default_gray_limit))
 
 
@@ -280,15 +427,9 @@ def apply_blue_rubies_rule(state: GameStateTD, pid: int, base_ruby_gain: int, la
     """
     Return ruby gain for this player, possibly modified by active blue card.
     """
-    card = get_active_blue_card(state)
-    if not card:
+    fn, card = _active_blue_handler(state, BLUE_RUBIES_RULES)
+    if fn is None:
         return base_ruby_gain
-
-    card_id = card.get("card_id", "")
-    fn = BLUE_RUBIES_RULES.get(card_id)
-    if not fn:
-        return base_ruby_gain
-
     return fn(state, card, pid, RubiesContext(base_ruby_gain, landed_on_ruby))
 
 
@@ -296,44 +437,38 @@ def apply_blue_score_rule(state: GameStateTD, pid: int, add_coins: int, add_vp:
     """
     Return (coins, vp) delta, possibly modified by active blue card.
     """
-    card = get_active_blue_card(state)
-    if not card:
+    fn, card = _active_blue_handler(state, BLUE_SCORE_RULES)
+    if fn is None:
         return add_coins, add_vp
-
-    card_id = card.get("card_id", "")
-    fn = BLUE_SCORE_RULES.get(card_id)
-    if not fn:
-        return add_coins, add_vp
-
     return fn(state, card, pid, ScoreContext(add_coins, add_vp, landed_on_ruby))
 
 
 # -----------------------------
 # Event card timing + hooks
 # -----------------------------
-def execute_purple_event_now(state: GameStateTD, card: dict, player_ids: List[int], rng: random.Random) -> None:
+def execute_purple_event_now(state: GameStateTD, card: EventCard, player_ids: PlayerIds, rng: random.Random) -> None:
     """
     Execute purple card effect immediately after draw+confirm.
 
     Runtime behavior:
-    - Dispatch by card_id using PURPLE_EFFECTS.
+    - Dispatch by card.event_id using PURPLE_EFFECTS.
     - The handler is responsible for any per-player prompting or global confirmation.
     - `scope` remains useful metadata for logging, but does not drive execution here.
     """
-    card_id = card.get("card_id", "?")
-    title = card.get("title", "")
-    scope = card.get("scope") or "global"
+    card_id = card.card_id
+    title = card_title(card_id)
+    scope = card.scope if card.scope is not None else EventScope.GLOBAL
 
-    broadcast(state, f"\n[PURPLE EVENT] Executing {card_id} — {title} (scope={scope}).")
+    broadcast(state, f"\n[PURPLE EVENT] Executing {card_id} — {title} (scope={scope.label}).")
 
-    fn = PURPLE_EFFECTS.get(card_id)
+    fn = PURPLE_EFFECTS.get(card.event_id)
     if not fn:
         # Fallback: no implementation yet.
         broadcast(state, f"[PURPLE EVENT] No implementation registered for {card_id}. (stub)")
         # Optional: keep your previous “manual resolve” behavior as a placeholder:
-        if scope == "per_player":
+        if scope == EventScope.PER_PLAYER:
             for pid in player_ids:
-                input(f"Player {pid}: resolve {card_id} manually, then press Enter...")
+                _prompt(state, pid, f"Player {pid}: resolve {card_id} manually, then press Enter...", "")
         else:
             confirm_all_players(state, player_ids, f"Resolve {card_id} (global) manually. Confirm when done.")
         broadcast(state, f"[PURPLE EVENT] Completed (stub) for {card_id}.")
@@ -344,52 +479,71 @@ def execute_purple_event_now(state: GameStateTD, card: dict, player_ids: List[in
 
     broadcast(state, f"[PURPLE EVENT] Completed execution for {card_id}.")
 
-def _purple_ev12_alms(state: GameStateTD, card: dict, player_ids: List[int], rng: random.Random) -> None:
+def _fewest_by(state: GameStateTD, player_ids: PlayerIds, key: str) -> tuple[int, List[int]]:
+    """
+    Single pass over players: return (lowest value of players[pid].<key>, pids holding it).
+    Shared by "the player(s) with the fewest X" event cards.
+    """
+    min_v: Optional[int] = None
+    targets: List[int] = []
+    players = state["players"]
+    for pid in player_ids:
+        v = getattr(players[pid], key)
+        if min_v is None or v < min_v:
+            min_v = v
+            targets = [pid]
+        elif v == min_v:
+            targets.append(pid)
+    return (min_v if min_v is not None else 0), targets
+
+
+def _purple_ev12_alms(state: GameStateTD, card: EventCard, player_ids: PlayerIds, rng: random.Random) -> None:
     # The player(s) with the fewest rubies receive(s) 1 ruby.
-    rubies_by_pid = {pid: int(state["players"][pid]["rubies"]) for pid in player_ids}
-    min_r = min(rubies_by_pid.values())
-    targets = [pid for pid, r in rubies_by_pid.items() if r == min_r]
+    min_r, targets = _fewest_by(state, player_ids, "rubies")
 
     for pid in targets:
-        state["players"][pid]["rubies"] += 1
+        state["players"][pid].rubies += 1
 
     broadcast(state, f"[EV12] Alms: fewest rubies={min_r} -> {targets} gain +1 ruby.")
 
-def _purple_ev13_14_choose_wisely(state: GameStateTD, card: dict, player_ids: List[int], rng: random.Random) -> None:
+def _purple_ev13_14_choose_wisely(state: GameStateTD, card: EventCard, player_ids: PlayerIds, rng: random.Random) -> None:
     # Choose: Move droplet +2 OR take 1 purple chip (we'll implement the purple chip transfer in actions.py)
-    from actions import take_any_chip_of_color_from_box_to_bag  # you will add this
-
     for pid in player_ids:
-        broadcast(state, f"[{card['card_id']}] Player {pid} choice.")
+        broadcast(state, f"[{card.card_id}] Player {pid} choice.")
         while True:
-            choice = input(f"Player {pid}: (d)roplet +2 OR take (p)urple chip? [d/p]: ").strip().lower()
+            choice = _prompt(state, pid, f"Player {pid}: (d)roplet +2 OR take (p)urple chip? [d/p]: ", "d").strip().lower()
             if choice in ("d", ""):
-                state["players"][pid]["droplet_pos"] = int(state["players"][pid].get("droplet_pos", 0)) + 2
-                broadcast(state, f"Player {pid}: droplet_pos increased to {state['players'][pid]['droplet_pos']}.")
+                state["players"][pid].droplet_pos += 2
+                broadcast(state, f"Player {pid}: droplet_pos increased to {state['players'][pid].droplet_pos}.")
                 break
             if choice in ("p", "purple"):
                 cid = take_any_chip_of_color_from_box_to_bag(state, pid, color="purple")
                 broadcast(state, f"Player {pid}: took purple chip {cid} from box to bag.")
                 break
-            print("Please enter 'd' or 'p'.")
+            _tell(state, "Please enter 'd' or 'p'.")
 
 
 PURPLE_EFFECTS.update({
-    "EV12": _purple_ev12_alms,
-    "EV13": _purple_ev13_14_choose_wisely,
-    "EV14": _purple_ev13_14_choose_wisely,
+    EventID.EV12: _purple_ev12_alms,
+    EventID.EV13: _purple_ev13_14_choose_wisely,
+    EventID.EV14: _purple_ev13_14_choose_wisely,
 })
 
 
 
-def note_blue_event_active(state: GameStateTD, card: dict, round_no: int) -> None:
+def note_blue_event_active(state: GameStateTD, card: EventCard, round_no: int) -> None:
     """
     Mark blue card as active for the duration of this round.
     The effect is applied via dispatch tables inside later phases.
+
+    Invariant: `card` is a well-formed EventCard (card_id and color always set),
+    which `_active_blue_handler` relies on; only blue cards get here, so a set
+    `active_blue_card_id` means "a blue card is active".
     """
     state["active_blue_event"] = card
-    card_id = card.get("card_id", "?")
-    title = card.get("title", "")
+    state["active_blue_card_id"] = card.event_id   # cached (int) for the per-chip rule lookups
+    card_id = card.card_id
+    title = card_title(card_id)
     broadcast(state, f"\n[BLUE EVENT] {card_id} — {title} is ACTIVE for the duration of round {round_no}.")
 
 
@@ -400,60 +554,69 @@ def blue_event_hook(state: GameStateTD, phase_name: str) -> None:
     card = get_active_blue_card(state)
     if not card:
         return
-    card_id = card.get("card_id", "?")
-    title = card.get("title", "")
+    card_id = card.card_id
+    title = card_title(card_id)
     broadcast(state, f"[BLUE EVENT] {card_id} — {title} is active for phase: {phase_name}.")
 
 
 # -----------------------------
 # Phase stubs (replace later)
 # -----------------------------
-def phase_start(state: GameStateTD, round_no: int, player_ids: List[int], rng: random.Random) -> None:
+_ROUND_HEADER_TPL = (
+    "\n==============================\n"
+    "ROUND {n}/9 — START\n"
+    "=============================="
+)
+
+
+def phase_start(state: GameStateTD, round_no: int, player_ids: PlayerIds, rng: random.Random) -> None:
     # Clear per-round event pointers at round start
     state["current_event"] = None
     state["active_blue_event"] = None
+    state["active_blue_card_id"] = None
 
-    broadcast(state, f"\n==============================")
-    broadcast(state, f"ROUND {round_no}/9 — START")
-    broadcast(state, f"==============================")
+    broadcast(state, _ROUND_HEADER_TPL.format(n=round_no))
 
     # NEW: show full player table at start of round
     broadcast_player_table(state, player_ids, title=f"PLAYER STATE — Round {round_no} start")
 
 
-def phase_event_card(state: GameStateTD, round_no: int, player_ids: List[int], rng: random.Random) -> None:
+def phase_event_card(state: GameStateTD, round_no: int, player_ids: PlayerIds, rng: random.Random) -> None:
     """
-    Draw one event card randomly WITHOUT replacement.
+    Draw one event card randomly WITHOUT replacement
+    (the next card of the deck shuffled once in run_game).
     - Purple: execute immediately after unanimous confirmation (one-shot)
     - Blue: becomes active for duration of the round (applied via dispatch tables)
     """
-    if not state["event_deck"]:
+    deck = state["event_deck"]
+    cursor = state["event_cursor"]
+    if cursor >= len(deck):
         state["current_event"] = None
         broadcast(state, f"\n[EVENT CARD] Round {round_no}: No cards left in deck.")
         confirm_all_players(state, player_ids, "No event card available. Proceed?")
         return
 
-    idx = rng.randrange(len(state["event_deck"]))
-    card = state["event_deck"].pop(idx)
+    card = deck[cursor]
+    state["event_cursor"] = cursor + 1
 
     state["current_event"] = card
     state["event_discard"].append(card)
 
-    card_id = card.get("card_id", "?")
-    title = card.get("title", "")
-    color = card.get("color", "?")
-    desc = card.get("description", "")
+    card_id = card.card_id
+    title = card_title(card_id)
+    color = card.color
+    desc = card_description(card_id)
 
-    broadcast(state, f"\n[EVENT CARD] Round {round_no}: Drew {card_id} ({color}) — {title}")
+    broadcast(state, f"\n[EVENT CARD] Round {round_no}: Drew {card_id} ({color.label}) — {title}")
     if desc:
         broadcast(state, f"[EVENT CARD] Description: {desc}")
 
     confirm_all_players(state, player_ids, "Event card acknowledged.")
 
-    if color == "purple":
+    if color == EventColor.PURPLE:
         execute_purple_event_now(state, card, player_ids, rng)
         confirm_all_players(state, player_ids, "Purple event resolved. Proceed to rat-tails?")
-    elif color == "blue":
+    elif color == EventColor.BLUE:
         note_blue_event_active(state, card, round_no)
         confirm_all_players(state, player_ids, "Blue event is active. Proceed to rat-tails?")
     else:
@@ -461,7 +624,7 @@ def phase_event_card(state: GameStateTD, round_no: int, player_ids: List[int], r
         confirm_all_players(state, player_ids, "Proceed to rat-tails?")
 
 
-def phase_rat_tails(state: GameStateTD, round_no: int, player_ids: List[int], rng: random.Random) -> None:
+def phase_rat_tails(state: GameStateTD, round_no: int, player_ids: PlayerIds, rng: random.Random) -> None:
     """
     Determine per-player rat-tail count for this round.
     This value is transient and MUST be recomputed every round.
@@ -472,19 +635,19 @@ def phase_rat_tails(state: GameStateTD, round_no: int, player_ids: List[int], rn
     for pid in player_ids:
         ensure_player(state, pid)
         while True:
-            s = input(f"Player {pid} rat-tails this round (integer, default 0): ").strip()
+            s = _prompt(state, pid, f"Player {pid} rat-tails this round (integer, default 0): ", "").strip()
             if s == "":
                 rt[pid] = 0
                 break
             try:
                 v = int(s)
                 if v < 0:
-                    print("Please enter 0 or a positive integer.")
+                    _tell(state, "Please enter 0 or a positive integer.")
                     continue
                 rt[pid] = v
                 break
             except ValueError:
-                print("Please enter an integer (e.g., 0, 1, 2).")
+                _tell(state, "Please enter an integer (e.g., 0, 1, 2).")
 
     
 
@@ -497,7 +660,7 @@ def phase_rat_tails(state: GameStateTD, round_no: int, player_ids: List[int], rn
     confirm_all_players(state, player_ids, "Rat-tails done. Proceed to drawing phase?")
 
 
-def phase_drawing(state: GameStateTD, round_no: int, player_ids: List[int], rng: random.Random) -> None:
+def phase_drawing(state: GameStateTD, round_no: int, player_ids: PlayerIds, rng: random.Random) -> None:
     """
     Drawing is local interaction, but outcomes are transparent.
 
@@ -533,47 +696,29 @@ def phase_drawing(state: GameStateTD, round_no: int, player_ids: List[int], rng:
     # Blue event can modify explosion threshold (gray_limit)
     effective_gray_limit = apply_blue_draw_rule(state, gray_limit)
     if effective_gray_limit != gray_limit:
-        broadcast(state, f"\n[DRAWING] Explosion limit modified by blue event: {gray_limit} -> {effective_gray_limit}")
+        broadcast(state, "\n[DRAWING] Explosion limit modified by blue event: %s -> %s", gray_limit, effective_gray_limit)
 
     broadcast(state, "\n[DRAWING] Players draw individually. Busts are public.")
-    results: dict[int, dict] = {}
-
-    from actions import (
-        draw_n_from_bag_to_palm,
-        move_chip_palm_to_pot,
-        return_all_palm_to_bag,
-        return_chip_from_pot_to_bag,
-        pot_sums,
-    )
-
-    def landing_rewards_for_position(pos_last: int) -> tuple[int, int, bool, int]:
-        """
-        Your current board helper is based on 'total_sum' and uses total_sum+1 as landing.
-        Here we already track a true board position (pos_last).
-        So: landing field index == pos_last (clamped).
-        Returns: (coins, vp, ruby, landing_index).
-        """
-        landing_index = pos_last
+    # One slot per player up front (filled in player order below); the dict never
+    # grows or rehashes while drawing, and phases keep indexing it by pid.
+    results: dict[int, Optional[DrawResult]] = dict.fromkeys(player_ids)
 
-        if not BOARD_FIELDS:
-            return 0, 0, False, landing_index
-
-        if landing_index < 0:
-            landing_index = 0
-        if landing_index >= len(BOARD_FIELDS):
-            landing_index = len(BOARD_FIELDS) - 1
-
-        f = BOARD_FIELDS[landing_index]
-        return int(f["coins"]), int(f["victory_points"]), bool(f["ruby"]), landing_index
+    # Flat per-chip tables (built once in build_pool)
+    chip_type_id = state["chip_type_id"]
+    chip_color = state["chip_color"]
+    chip_value = state["chip_value"]
+    log_enabled = state["log_enabled"]   # skip building palm listings nobody reads
 
     for pid in player_ids:
         ensure_player(state, pid)
-        broadcast(state, f"\n--- Player {pid} drawing starts ---")
+
+        ps = state["players"][pid]
+        palm = state["palms"][pid]
 
         exploded = False
 
         # per-player start position
-        droplet_pos = int(state["players"][pid].get("droplet_pos", 0))
+        droplet_pos = ps.droplet_pos
         rat_tails = int(rat_tails_map.get(pid, 0))
         pos_start = droplet_pos + rat_tails
 
@@ -587,139 +732,139 @@ def phase_drawing(state: GameStateTD, round_no: int, player_ids: List[int], rng:
             "rat_tails": rat_tails,
         }
 
-        broadcast(state, f"[Player {pid}] START POS | droplet_pos={droplet_pos} + rat_tails={rat_tails} => pos_start={pos_start}")
+        if log_enabled:
+            broadcast_block(state, [
+                f"\n--- Player {pid} drawing starts ---",
+                f"[Player {pid}] START POS | droplet_pos={droplet_pos} + rat_tails={rat_tails} => pos_start={pos_start}",
+            ])
 
         while True:
-            ans = input(f"[Player {pid}] Continue drawing? [y/n]: ").strip().lower()
+            ans = _prompt(state, pid, "[Player %s] Continue drawing? [y/n]: ", "y", pid).strip().lower()
             if ans in ("n", "no"):
-                broadcast(state, f"[Player {pid}] stops drawing voluntarily.")
+                broadcast(state, "[Player %s] stops drawing voluntarily.", pid)
                 # invariant: palm must be empty
-                if state["palms"][pid]:
+                if palm:
                     returned = return_all_palm_to_bag(state, pid)
-                    broadcast(state, f"[Player {pid}] SAFETY: Returned leftover PALM chips to bag: {returned}")
+                    broadcast(state, "[Player %s] SAFETY: Returned leftover PALM chips to bag: %s", pid, returned)
                 break
             if ans not in ("y", "yes"):
-                print("Please enter 'y' or 'n'.")
+                _tell(state, "Please enter 'y' or 'n'.")
                 continue
 
             # --- Step 1: draw N chips to PALM ---
             while True:
-                s = input(f"[Player {pid}] How many chips to draw to PALM (default 1)? ").strip()
+                s = _prompt(state, pid, "[Player %s] How many chips to draw to PALM (default 1)? ", "", pid).strip()
                 if s == "":
                     n_palm = 1
                     break
                 try:
                     n_palm = int(s)
                     if n_palm <= 0:
-                        print("Please enter a positive integer (>=1).")
+                        _tell(state, "Please enter a positive integer (>=1).")
                         continue
                     break
                 except ValueError:
-                    print("Please enter an integer (e.g., 1, 2, 3).")
+                    _tell(state, "Please enter an integer (e.g., 1, 2, 3).")
 
             drawn = draw_n_from_bag_to_palm(state, pid, n_palm, rng=rng)
 
             if not drawn:
-                broadcast(state, f"[Player {pid}] Bag is empty. No chip drawn.")
-                if state["palms"][pid]:
+                broadcast(state, "[Player %s] Bag is empty. No chip drawn.", pid)
+                if palm:
                     returned = return_all_palm_to_bag(state, pid)
-                    broadcast(state, f"[Player {pid}] SAFETY: Returned leftover PALM chips to bag: {returned}")
+                    broadcast(state, "[Player %s] SAFETY: Returned leftover PALM chips to bag: %s", pid, returned)
                 break
 
-            # show palm content
-            palm_list = list(state["palms"][pid])
+            # show palm content (the live palm list is not touched until a chip is picked)
             palm_options = []
-            for idx, cid in enumerate(palm_list):
-                tid = state["chips"][cid]["type_id"]
-                ctype = state["chip_types"][tid]
-                palm_options.append(
-                    f"{idx} -> {ctype['color']} v={int(ctype['value'])}"
-                )
+            if log_enabled:
+                palm_lines = [f"[Player {pid}] PALM (select by NUMBER):"]
+                for idx, cid in enumerate(palm):
+                    label = f"{COLOR_NAMES[chip_color[cid]]} v={chip_value[cid]}"
+                    palm_options.append(f"{idx} -> {label}")
+                    palm_lines.append(f"  [{idx}] {label} ({cid})")
 
-            broadcast(state, f"[Player {pid}] PALM (select by NUMBER):")
-
-            for idx, cid in enumerate(palm_list):
-                tid = state["chips"][cid]["type_id"]
-                ctype = state["chip_types"][tid]
-                broadcast(
-                    state,
-                    f"  [{idx}] {ctype['color']} v={int(ctype['value'])} ({cid})"
-                )
+                broadcast_block(state, palm_lines)
 
             # --- Step 2: decision ---
             # - place exactly one
             # - OR return all (if allowed)
             if allow_return_all:
                 while True:
-                    choice = input(f"[Player {pid}] Action: (p)lace one to pot OR (r)eturn all to bag? [p/r]: ").strip().lower()
+                    choice = _prompt(
+                        state, pid, "[Player %s] Action: (p)lace one to pot OR (r)eturn all to bag? [p/r]: ", "p", pid
+                    ).strip().lower()
                     if choice in ("p", "place", ""):
                         choice = "p"
                         break
                     if choice in ("r", "return"):
                         choice = "r"
                         break
-                    print("Please enter 'p' or 'r'.")
+                    _tell(state, "Please enter 'p' or 'r'.")
             else:
                 # forbidden branch (still explicit)
                 broadcast(
                     state,
-                    f"[Player {pid}] Action: place ONE chip to pot "
-                    f"(return-all is NOT allowed now)."
+                    "[Player %s] Action: place ONE chip to pot "
+                    "(return-all is NOT allowed now).",
+                    pid,
                 )
                 choice = "p"
 
             if choice == "r":
                 returned = return_all_palm_to_bag(state, pid)
-                broadcast(state, f"[Player {pid}] Returned palm chips to bag: {returned}")
+                broadcast(state, "[Player %s] Returned palm chips to bag: %s", pid, returned)
                 # proceed to next drawing prompt
                 continue
 
             # choice == "p": place exactly one from palm
-            broadcast(state, f"[Player {pid}] Choose chip to PLACE:")
+            broadcast(state, "[Player %s] Choose chip to PLACE:", pid)
             for line in palm_options:
-                broadcast(state, f"  {line}")
+                broadcast(state, "  %s", line)
 
             while True:
-                s = input("Selection: ").strip()
+                s = _prompt(state, pid, "Selection: ", "0").strip()
                 try:
                     idx = int(s)
-                    if 0 <= idx < len(palm_list):
-                        placed_cid = palm_list[idx]
+                    if 0 <= idx < len(palm):
+                        placed_cid = palm[idx]
                         break
                     else:
-                        print("Index out of range.")
+                        _tell(state, "Index out of range.")
                 except ValueError:
-                    print("Please enter a valid integer key.")
+                    _tell(state, "Please enter a valid integer key.")
 
-            # move chosen chip to pot
-            move_chip_palm_to_pot(state, pid, placed_cid)
+            # move chosen chip to pot and ALWAYS flush remaining palm back to bag
+            returned_rest = place_one_and_flush_palm(state, pid, placed_cid)
+            if returned_rest:
+                broadcast(state, "[Player %s] Returned remaining PALM chips to bag: %s", pid, returned_rest)
+
+            # placed chip's color/value: read once, shared by the potion/EV15 checks and the log line
+            color_code = chip_color[placed_cid]
+            base_val = chip_value[placed_cid]
 
-            # ALWAYS flush remaining palm back to bag
-            if state["palms"][pid]:
-                returned_rest = return_all_palm_to_bag(state, pid)
-                broadcast(state, f"[Player {pid}] Returned remaining PALM chips to bag: {returned_rest}")
-            
             # --- POTION RULE (new) ---
             # If you PLACE a gray chip, have NOT exploded, and potion is filled:
             # you may use the potion to undo this placement (return just placed gray chip to bag)
-            placed_tid = state["chips"][placed_cid]["type_id"]
-            placed_ctype = state["chip_types"][placed_tid]
-            placed_color = placed_ctype["color"]
-
-            if placed_color == "gray" and (not exploded) and bool(state["players"][pid].get("potion_filled", True)):
-                yn = input(
-                    f"[Player {pid}] Potion available: you placed a GRAY chip ({placed_cid}). "
-                    f"Use potion to put it back into the bag? [y/n]: "
+            if color_code == Color.GRAY and (not exploded) and ps.potion_filled:
+                yn = _prompt(
+                    state,
+                    pid,
+                    "[Player %s] Potion available: you placed a GRAY chip (%s). "
+                    "Use potion to put it back into the bag? [y/n]: ",
+                    "y",
+                    pid, placed_cid,
                 ).strip().lower()
 
                 if yn in ("y", "yes", ""):
                     # undo placement
                     return_chip_from_pot_to_bag(state, pid, placed_cid)
-                    state["players"][pid]["potion_filled"] = False
+                    ps.potion_filled = False
                     broadcast(
                         state,
-                        f"[Player {pid}] POTION USED: returned just placed gray chip {placed_cid} back to bag. "
-                        f"Potion is now EMPTY."
+                        "[Player %s] POTION USED: returned just placed gray chip %s back to bag. "
+                        "Potion is now EMPTY.",
+                        pid, placed_cid,
                     )
                     # Important: do NOT advance pos_last, do NOT apply on-draw effects for this chip.
                     # Proceed to next iteration (player will be prompted to draw again as usual).
@@ -730,27 +875,26 @@ def phase_drawing(state: GameStateTD, round_no: int, player_ids: List[int], rng:
             pos_last += int(step)
             trackers[pid]["pos_last"] = pos_last
 
-            tid = state["chips"][placed_cid]["type_id"]
-            ctype = state["chip_types"][tid]
-            base_val = int(ctype["value"])
-            color = ctype["color"]
-
             # EV15 (blue): first gray chip you draw this round may be returned to bag
-            active = get_active_blue_card(state)
-            if active and active.get("card_id") == "EV15":
-                if color == "gray" and not bool(ev15_used.get(pid, False)):
-                    yn = input(
-                        f"[Player {pid}] EV15: Return this first gray chip {placed_cid} to bag? [y/n]: ").strip().lower()
+            if state.get("active_blue_card_id") == EventID.EV15:
+                if color_code == Color.GRAY and not bool(ev15_used.get(pid, False)):
+                    yn = _prompt(
+                        state,
+                        pid,
+                        "[Player %s] EV15: Return this first gray chip %s to bag? [y/n]: ",
+                        "y",
+                        pid, placed_cid,
+                    ).strip().lower()
                     if yn in ("y", "yes", ""):
                         return_chip_from_pot_to_bag(state, pid, placed_cid)
                         ev15_used[pid] = True
-                        broadcast(state, f"[Player {pid}] EV15: returned {placed_cid} to bag (effect consumed).")
+                        broadcast(state, "[Player %s] EV15: returned %s to bag (effect consumed).", pid, placed_cid)
                         # IMPORTANT: This does NOT change pos_last (monotonic), by your design.
                     else:
                         ev15_used[pid] = True  # effect consumed even if declined
 
             # --- immediate ON-DRAW effects (policy dispatch) ---
-            apply_on_place_effects(state, pid, placed_cid)
+            apply_on_place_effects(state, pid, placed_cid, CLI_ON_PLACE_CTX)
 
             # sums from CURRENT pot contents
             gray_sum, chip_sum = pot_sums(state, pid)
@@ -760,52 +904,60 @@ def phase_drawing(state: GameStateTD, round_no: int, player_ids: List[int], rng:
 
             broadcast(
                 state,
-                f"[Player {pid}] PLACED {placed_cid} ({tid}, {color}, base_v={base_val}, step={step}) | "
-                f"GRAY_SUM={gray_sum} CHIP_SUM={chip_sum} | "
-                f"POS_START={pos_start} POS_LAST={pos_last} => "
-                f"LAND={landing_index}: coins={coins}, vp={vp}, ruby={'YES' if ruby else 'NO'}"
+                "[Player %s] PLACED %s (%s, %s, base_v=%s, step=%s) | "
+                "GRAY_SUM=%s CHIP_SUM=%s | "
+                "POS_START=%s POS_LAST=%s => "
+                "LAND=%s: coins=%s, vp=%s, ruby=%s",
+                pid, placed_cid, chip_type_id[placed_cid], COLOR_NAMES[color_code], base_val, step,
+                gray_sum, chip_sum,
+                pos_start, pos_last,
+                landing_index, coins, vp, "YES" if ruby else "NO",
             )
 
             # explosion check
             if gray_sum > effective_gray_limit:
                 exploded = True
-                broadcast(state, f"[Player {pid}] EXPLODED: GRAY_SUM {gray_sum} > {effective_gray_limit}. Drawing stops.")
+                broadcast(state, "[Player %s] EXPLODED: GRAY_SUM %s > %s. Drawing stops.", pid, gray_sum, effective_gray_limit)
                 # invariant: palm empty
-                if state["palms"][pid]:
+                if palm:
                     returned = return_all_palm_to_bag(state, pid)
-                    broadcast(state, f"[Player {pid}] SAFETY: Returned leftover PALM chips to bag: {returned}")
+                    broadcast(state, "[Player %s] SAFETY: Returned leftover PALM chips to bag: %s", pid, returned)
                 break
 
         # finalize player result snapshot
         gray_sum, chip_sum = pot_sums(state, pid)
         coins, vp, ruby, landing_index = landing_rewards_for_position(pos_last)
 
-        results[pid] = {
-            "droplet_pos": droplet_pos,
-            "rat_tails": rat_tails,
-            "pos_start": pos_start,
-            "pos_last": pos_last,
-            "gray_sum": gray_sum,
-            "chip_sum": chip_sum,
-            "exploded": exploded,
-            "landing_index": landing_index,
-            "landing_coins": coins,
-            "landing_vp": vp,
-            "landing_ruby": ruby,
-        }
+        results[pid] = DrawResult(
+            droplet_pos=droplet_pos,
+            rat_tails=rat_tails,
+            pos_start=pos_start,
+            pos_last=pos_last,
+            gray_sum=gray_sum,
+            chip_sum=chip_sum,
+            exploded=exploded,
+            landing_index=landing_index,
+            landing_coins=coins,
+            landing_vp=vp,
+            landing_ruby=ruby,
+        )
 
         broadcast(
             state,
-            f"[Player {pid}] DRAW RESULT | POS_START={pos_start} POS_LAST={pos_last} "
-            f"CHIP_SUM={chip_sum} GRAY_SUM={gray_sum} "
-            f"EXPLODED={'YES' if exploded else 'NO'} | "
-            f"LAND={landing_index} coins={coins} vp={vp} ruby={'YES' if ruby else 'NO'}"
+            "[Player %s] DRAW RESULT | POS_START=%s POS_LAST=%s "
+            "CHIP_SUM=%s GRAY_SUM=%s "
+            "EXPLODED=%s | "
+            "LAND=%s coins=%s vp=%s ruby=%s",
+            pid, pos_start, pos_last,
+            chip_sum, gray_sum,
+            "YES" if exploded else "NO",
+            landing_index, coins, vp, "YES" if ruby else "NO",
         )
 
         # hard invariant at end of player's drawing: palm must be empty
-        if state["palms"][pid]:
+        if palm:
             returned = return_all_palm_to_bag(state, pid)
-            broadcast(state, f"[Player {pid}] SAFETY: Returned leftover PALM chips to bag: {returned}")
+            broadcast(state, "[Player %s] SAFETY: Returned leftover PALM chips to bag: %s", pid, returned)
 
     state["round_ctx"]["drawing_results"] = results
     confirm_all_players(state, player_ids, "Drawing done for all. Proceed to winner/dice phase?")
@@ -813,55 +965,100 @@ def phase_drawing(state: GameStateTD, round_no: int, player_ids: List[int], rng:
 
 
 
-def phase_winner_and_dice(state: GameStateTD, round_no: int, player_ids: List[int], rng: random.Random) -> None:
+# -----------------------------
+# Winner dice faces
+# -----------------------------
+# Each handler applies its face to the rolling player and returns the log text.
+DiceEffectFn = Callable[[GameStateTD, int, PlayerState], str]
+
+
+def _dice_vp_1(state: GameStateTD, pid: int, ps: PlayerState) -> str:
+    ps.victory_points += 1
+    return "Gain +1 VP"
+
+
+def _dice_vp_2(state: GameStateTD, pid: int, ps: PlayerState) -> str:
+    ps.victory_points += 2
+    return "Gain +2 VP"
+
+
+def _dice_orange_chip(state: GameStateTD, pid: int, ps: PlayerState) -> str:
+    try:
+        cid = take_any_chip_of_color_from_box_to_bag(state, pid, color="orange")
+        return f"Take 1 orange chip from box → bag ({cid})"
+    except ValueError:
+        return "Take 1 orange chip from box → bag (NONE AVAILABLE)"
+
+
+def _dice_ruby(state: GameStateTD, pid: int, ps: PlayerState) -> str:
+    ps.rubies += 1
+    return "Gain +1 ruby"
+
+
+def _dice_droplet(state: GameStateTD, pid: int, ps: PlayerState) -> str:
+    ps.droplet_pos += 1
+    return f"Move droplet +1 (now {ps.droplet_pos})"
+
+
+_DICE_FACES = (1, 2, 3, 4, 5, 6)
+
+# Indexed by the rolled face (index 0 unused):
+# 1: +1 VP, 2: +1 VP, 3: +2 VP, 4: +1 orange chip from box -> bag, 5: +1 ruby, 6: droplet +1
+DICE_EFFECTS: tuple[Optional[DiceEffectFn], ...] = (
+    None,
+    _dice_vp_1,
+    _dice_vp_1,
+    _dice_vp_2,
+    _dice_orange_chip,
+    _dice_ruby,
+    _dice_droplet,
+)
+
+
+def phase_winner_and_dice(state: GameStateTD, round_no: int, player_ids: PlayerIds, rng: random.Random) -> None:
     blue_event_hook(state, "winner_and_dice")
     results = state["round_ctx"]["drawing_results"]
 
-    # Determine winners (same as before)
-    eligible = [(pid, results[pid]["pos_last"]) for pid in player_ids if not results[pid]["exploded"]]
-    if not eligible:
-        eligible = [(pid, results[pid]["pos_last"]) for pid in player_ids]
-
-    max_pos = max(p for _, p in eligible)
-    winners = [pid for pid, p in eligible if p == max_pos]
+    # Determine winners (same as before): highest POS_LAST among non-exploded
+    # players, or among everyone if all exploded. One pass keeps two running
+    # maxima (non-exploded players / everyone) and picks one afterwards.
+    alive_max = all_max = -1
+    alive_winners: List[int] = []
+    all_winners: List[int] = []
+    for pid in player_ids:
+        res = results[pid]
+        pos = res.pos_last
+        if pos > all_max:
+            all_max = pos
+            all_winners = [pid]
+        elif pos == all_max:
+            all_winners.append(pid)
+        if res.exploded:
+            continue
+        if pos > alive_max:
+            alive_max = pos
+            alive_winners = [pid]
+        elif pos == alive_max:
+            alive_winners.append(pid)
+
+    if alive_winners:
+        winners, max_pos = alive_winners, alive_max
+    else:
+        winners, max_pos = all_winners, all_max
 
     broadcast(state, f"\n[WINNER] Winner(s) of draw-phase: {winners} (max POS_LAST={max_pos})")
 
     # Dice results are round-local (useful for debugging/tests)
     dice_results = state["round_ctx"].setdefault("dice_results", {})
 
-    # Dice faces:
-    # 1: +1 VP
-    # 2: +1 VP
-    # 3: +2 VP
-    # 4: +1 orange chip from box -> bag
-    # 5: +1 ruby
-    # 6: droplet +1
-    from actions import take_any_chip_of_color_from_box_to_bag
-
-    for pid in winners:
-        roll = rng.randint(1, 6)
+    # Dice faces: see DICE_EFFECTS
+    # All winners' rolls drawn in one call
+    rolls = rng.choices(_DICE_FACES, k=len(winners))
+    for pid, roll in zip(winners, rolls):
+        ps = state["players"][pid]
 
         # Apply effect
-        effect_desc = ""
-        if roll in (1, 2):
-            state["players"][pid]["victory_points"] += 1
-            effect_desc = "Gain +1 VP"
-        elif roll == 3:
-            state["players"][pid]["victory_points"] += 2
-            effect_desc = "Gain +2 VP"
-        elif roll == 4:
-            try:
-                cid = take_any_chip_of_color_from_box_to_bag(state, pid, color="orange")
-                effect_desc = f"Take 1 orange chip from box → bag ({cid})"
-            except ValueError:
-                effect_desc = "Take 1 orange chip from box → bag (NONE AVAILABLE)"
-        elif roll == 5:
-            state["players"][pid]["rubies"] += 1
-            effect_desc = "Gain +1 ruby"
-        elif roll == 6:
-            state["players"][pid]["droplet_pos"] = int(state["players"][pid].get("droplet_pos", 0)) + 1
-            effect_desc = f"Move droplet +1 (now {state['players'][pid]['droplet_pos']})"
+        effect_desc = DICE_EFFECTS[roll](state, pid, ps)
 
         dice_results[pid] = {"roll": roll, "effect": effect_desc}
 
@@ -871,16 +1068,15 @@ def phase_winner_and_dice(state: GameStateTD, round_no: int, player_ids: List[in
 
 
 
-def phase_chip_eval(state: GameStateTD, round_no: int, player_ids: List[int], rng: random.Random) -> None:
+def phase_chip_eval(state: GameStateTD, round_no: int, player_ids: PlayerIds, rng: random.Random) -> None:
     blue_event_hook(state, "chip_eval")
 
     broadcast(state, "\n[CHIP EVAL] (stub) Pot-content effects evaluated locally for each player.")
-    for pid in player_ids:
-        input(f"Player {pid}: press Enter when chip-eval done...")
+    _prompt_all(state, player_ids, lambda pid: f"Player {pid}: press Enter when chip-eval done...", "")
     confirm_all_players(state, player_ids, "Chip eval done. Proceed to ruby distribution?")
 
 
-def phase_rubies(state: GameStateTD, round_no: int, player_ids: List[int], rng: random.Random) -> None:
+def phase_rubies(state: GameStateTD, round_no: int, player_ids: PlayerIds, rng: random.Random) -> None:
     """
     Ruby distribution phase (simple core rule, hook kept).
 
@@ -890,10 +1086,10 @@ def phase_rubies(state: GameStateTD, round_no: int, player_ids: List[int], rng:
     - Otherwise, they gain 0.
 
     Input:
-    - state["round_ctx"]["drawing_results"][pid]["landing_ruby"] : bool
+    - state["round_ctx"]["drawing_results"][pid].landing_ruby : bool
 
     Effects:
-    - Updates: state["players"][pid]["rubies"]
+    - Updates: state["players"][pid].rubies
     - Logs: who gained a ruby and new totals
     """
     # Keep the phase hook for transparency/future blue-card phase awareness
@@ -903,72 +1099,85 @@ def phase_rubies(state: GameStateTD, round_no: int, player_ids: List[int], rng:
 
     broadcast(state, "\n[RUBIES] Distributing rubies based on landing fields.")
 
+    gain = 1  # no event modifiers yet
+    others: List[str] = []   # "pid (still N)" of players with no gain, reported together
+    log_enabled = state["log_enabled"]
+
     for pid in player_ids:
-        ensure_player(state, pid)
+        ps = state["players"][pid]
+        if not results[pid].landing_ruby:
+            if log_enabled:
+                others.append(f"{pid} (still {ps.rubies})")
+            continue
+        ps.rubies += gain
+        broadcast(
+            state,
+            f"Player {pid}: landed on RUBY field -> +{gain} ruby "
+            f"(now {ps.rubies})."
+        )
 
-        landed_on_ruby = bool(results[pid].get("landing_ruby", False))
-        gain = 1 if landed_on_ruby else 0  # no event modifiers yet
-
-        if gain:
-            state["players"][pid]["rubies"] += gain
-            broadcast(
-                state,
-                f"Player {pid}: landed on RUBY field -> +{gain} ruby "
-                f"(now {state['players'][pid]['rubies']})."
-            )
-        else:
-            broadcast(
-                state,
-                f"Player {pid}: no ruby field -> +0 rubies "
-                f"(still {state['players'][pid]['rubies']})."
-            )
+    if others:
+        broadcast(state, f"Player(s) {', '.join(others)}: no ruby field -> +0 rubies.")
 
     confirm_all_players(state, player_ids, "Rubies resolved. Proceed to VP/coins accounting?")
 
 
 
-def phase_vp_and_coins(state: GameStateTD, round_no: int, player_ids: List[int], rng: random.Random) -> None:
+def phase_vp_and_coins(state: GameStateTD, round_no: int, player_ids: PlayerIds, rng: random.Random) -> None:
     blue_event_hook(state, "vp_and_coins")
     results = state["round_ctx"]["drawing_results"]
 
     broadcast(state, "\n[SCORING] Adding landing rewards (coins + victory points). Transparent.")
 
+    nothing: List[int] = []   # players with no gain, reported together
     for pid in player_ids:
-        add_coins = results[pid]["landing_coins"]
-        add_vp = results[pid]["landing_vp"]
+        ps = state["players"][pid]
+        res = results[pid]
+        add_coins = res.landing_coins
+        add_vp = res.landing_vp
 
         add_coins, add_vp = apply_blue_score_rule(
             state,
             pid,
             add_coins,
             add_vp,
-            results[pid]["landing_ruby"],
+            res.landing_ruby,
         )
 
-        state["players"][pid]["coins"] += add_coins
-        state["players"][pid]["victory_points"] += add_vp
+        if not (add_coins or add_vp):
+            nothing.append(pid)
+            continue
+
+        ps.coins += add_coins
+        ps.victory_points += add_vp
 
         broadcast(
             state,
             f"Player {pid}: +{add_coins} coins, +{add_vp} VP "
-            f"=> coins={state['players'][pid]['coins']}, VP={state['players'][pid]['victory_points']}"
+            f"=> coins={ps.coins}, VP={ps.victory_points}"
         )
 
+    if nothing:
+        broadcast(state, f"Player(s) {nothing}: +0 coins, +0 VP.")
+
     confirm_all_players(state, player_ids, "Scoring acknowledged. Proceed to purchase phase?")
 
 
-def phase_purchase(state: GameStateTD, round_no: int, player_ids: List[int], rng: random.Random) -> None:
+def phase_purchase(state: GameStateTD, round_no: int, player_ids: PlayerIds, rng: random.Random) -> None:
     blue_event_hook(state, "purchase")
 
     broadcast(state, "\n[SHOP] (stub) Purchasing is local; results are shown to all.")
+    summaries = _prompt_all(
+        state, player_ids, lambda pid: f"Player {pid}: enter purchase summary (or empty) to broadcast: ", ""
+    )
     for pid in player_ids:
-        msg = input(f"Player {pid}: enter purchase summary (or empty) to broadcast: ").strip()
+        msg = summaries[pid].strip()
         if msg:
             broadcast(state, f"Player {pid} purchase: {msg}")
     confirm_all_players(state, player_ids, "Purchases done. Proceed to ruby trade phase?")
 
 
-def phase_ruby_trade(state: GameStateTD, round_no: int, player_ids: List[int], rng: random.Random) -> None:
+def phase_ruby_trade(state: GameStateTD, round_no: int, player_ids: PlayerIds, rng: random.Random) -> None:
     blue_event_hook(state, "ruby_trade")
 
     broadcast(state, "\n[RUBY TRADE] Spend 2 rubies to either:")
@@ -979,12 +1188,12 @@ def phase_ruby_trade(state: GameStateTD, round_no: int, player_ids: List[int], r
     RUBY_COST = 2
 
     for pid in player_ids:
-        ensure_player(state, pid)
+        ps = state["players"][pid]
 
         while True:
-            rubies = int(state["players"][pid]["rubies"])
-            droplet_pos = int(state["players"][pid].get("droplet_pos", 0))
-            potion_filled = bool(state["players"][pid].get("potion_filled", True))
+            rubies = ps.rubies
+            droplet_pos = ps.droplet_pos
+            potion_filled = ps.potion_filled
 
             broadcast(
                 state,
@@ -997,37 +1206,37 @@ def phase_ruby_trade(state: GameStateTD, round_no: int, player_ids: List[int], r
                 break
 
             # Menu
-            print(f"Player {pid} options:")
-            print("  [d] Spend 2 rubies -> droplet +1")
-            print("  [p] Spend 2 rubies -> refill potion (only if empty)")
-            print("  [q] Finish ruby trade for this player")
+            _tell(state, f"Player {pid} options:")
+            _tell(state, "  [d] Spend 2 rubies -> droplet +1")
+            _tell(state, "  [p] Spend 2 rubies -> refill potion (only if empty)")
+            _tell(state, "  [q] Finish ruby trade for this player")
 
-            choice = input(f"Player {pid} choice [d/p/q]: ").strip().lower()
+            choice = _prompt(state, pid, f"Player {pid} choice [d/p/q]: ", "q").strip().lower()
             if choice in ("q", "quit", "done", ""):
                 broadcast(state, f"Player {pid}: finished ruby trade.")
                 break
 
             if choice in ("d", "droplet"):
-                state["players"][pid]["rubies"] -= RUBY_COST
-                state["players"][pid]["droplet_pos"] = int(state["players"][pid].get("droplet_pos", 0)) + 1
+                ps.rubies -= RUBY_COST
+                ps.droplet_pos += 1
                 broadcast(
                     state,
-                    f"Player {pid}: spent {RUBY_COST} rubies -> droplet_pos now {state['players'][pid]['droplet_pos']} "
-                    f"(rubies left {state['players'][pid]['rubies']})."
+                    f"Player {pid}: spent {RUBY_COST} rubies -> droplet_pos now {ps.droplet_pos} "
+                    f"(rubies left {ps.rubies})."
                 )
                 continue
 
             if choice in ("p", "potion", "flask"):
-                if bool(state["players"][pid].get("potion_filled", True)):
+                if ps.potion_filled:
                     broadcast(state, f"Player {pid}: potion is already FILLED. Refill not allowed.")
                     continue
 
-                state["players"][pid]["rubies"] -= RUBY_COST
-                state["players"][pid]["potion_filled"] = True
+                ps.rubies -= RUBY_COST
+                ps.potion_filled = True
                 broadcast(
                     state,
                     f"Player {pid}: spent {RUBY_COST} rubies -> potion refilled "
-                    f"(rubies left {state['players'][pid]['rubies']})."
+                    f"(rubies left {ps.rubies})."
                 )
                 continue
 
@@ -1063,7 +1272,9 @@ ROUND_PHASES: List[PhaseId] = [
     "ruby_trade",
 ]
 
-PHASE_DISPATCH: dict[PhaseId, Callable[[GameStateTD, int, List[int], random.Random], None]] = {
+PhaseFn = Callable[[GameStateTD, int, PlayerIds, random.Random], None]
+
+PHASE_DISPATCH: dict[PhaseId, PhaseFn] = {
     "start": phase_start,
     "event_card": phase_event_card,
     "rat_tails": phase_rat_tails,
@@ -1089,6 +1300,13 @@ PHASE_REQUIRES: dict[PhaseId, List[str]] = {
     "ruby_trade": [],
 }
 
+# The round as run by run_round: (phase_id, phase fn, required round_ctx keys),
+# resolved once at import from the three tables above.
+ROUND_PIPELINE: tuple[tuple[PhaseId, PhaseFn, tuple[str, ...]], ...] = tuple(
+    (phase_id, PHASE_DISPATCH[phase_id], tuple(PHASE_REQUIRES.get(phase_id, ())))
+    for phase_id in ROUND_PHASES
+)
+
 
 
 # -----------------------------
@@ -1097,7 +1315,7 @@ PHASE_REQUIRES: dict[PhaseId, List[str]] = {
 def run_round(
     state: GameStateTD,
     round_no: int,
-    player_ids: List[int],
+    player_ids: PlayerIds,
     rng: random.Random,
     *,
     gray_limit: int = 7
@@ -1105,25 +1323,24 @@ def run_round(
     clear_round_ctx(state)
     state["round_ctx"]["gray_limit"] = gray_limit
 
-    for phase_id in ROUND_PHASES:
+    round_ctx = state["round_ctx"]
+    for phase_id, phase_fn, requires in ROUND_PIPELINE:
         # check requirements
-        for key in PHASE_REQUIRES.get(phase_id, []):
-            if key not in state["round_ctx"]:
+        for key in requires:
+            if key not in round_ctx:
                 raise RuntimeError(f"Phase '{phase_id}' requires missing round_ctx key: '{key}'")
 
         # call phase
-        PHASE_DISPATCH[phase_id](state, round_no, player_ids, rng)
+        phase_fn(state, round_no, player_ids, rng)
 
     # -------------------------
     # End-of-round cleanup
     # -------------------------
-    from actions import return_all_pot_to_bag, return_all_palm_to_bag
-
     broadcast(state, f"\n[ROUND {round_no}] CLEANUP: returning pot contents to bags.")
 
     for pid in player_ids:
         # Safety invariant: palm should be empty at end of a round, but enforce it.
-        if state.get("palms", {}).get(pid):
+        if state["palms"][pid]:
             leftover = return_all_palm_to_bag(state, pid)
             if leftover:
                 broadcast(state, f"[ROUND {round_no}] CLEANUP: Player {pid} had leftover PALM chips -> bag: {leftover}")
@@ -1133,23 +1350,42 @@ def run_round(
 
     # Clear round modifiers / pointers
     state["active_blue_event"] = None
+    state["active_blue_card_id"] = None
     state["current_event"] = None
 
+    trim_broadcast_log(state)
+
 
 
-def run_game(state: GameStateTD, player_count: int, *, seed: int = 42, gray_limit: int = 7) -> None:
-    player_ids = list(range(player_count))
+def run_game(
+    state: GameStateTD,
+    player_count: int,
+    *,
+    seed: int = 42,
+    gray_limit: int = 7,
+    auto_mode: bool = False,
+) -> None:
+    """
+    Run a full 9-round game in the terminal.
+    auto_mode=True answers every prompt with its default (no stdin reads).
+    """
+    state["auto_mode"] = auto_mode
+    player_ids: PlayerIds = tuple(range(player_count))
+    state["player_ids"] = player_ids
     for pid in player_ids:
         ensure_player(state, pid)
 
     rng = random.Random(seed)
 
-    state["event_deck"] = list(EVENT_DECK)
+    # Shuffle once per game; phase_event_card deals from it by cursor
+    state["event_deck"] = shuffled_deck(rng)
+    state["event_cursor"] = 0
     state["event_discard"] = []
     state["current_event"] = None
     state["active_blue_event"] = None
+    state["active_blue_card_id"] = None
 
-    broadcast(state, f"\nGAME START: players={player_ids}, rounds=9, seed={seed}, gray_limit={gray_limit}")
+    broadcast(state, f"\nGAME START: players={list(player_ids)}, rounds=9, seed={seed}, gray_limit={gray_limit}")
     confirm_all_players(state, player_ids, "Game start confirmed. Begin round 1?")
 
     for round_no in range(1, 10):  # 1..9
@@ -1158,7 +1394,7 @@ def run_game(state: GameStateTD, player_count: int, *, seed: int = 42, gray_limi
     broadcast(state, "\nGAME END — Final standings:")
     for pid in player_ids:
         ps = state["players"][pid]
-        broadcast(state, f"Player {pid}: VP={ps['victory_points']}, coins={ps['coins']}, rubies={ps['rubies']}")
+        broadcast(state, f"Player {pid}: VP={ps.victory_points}, coins={ps.coins}, rubies={ps.rubies}")
 
 
 def apply_ui_action(state: GameStateTD, pid: int, action_id: str, payload: dict | None) -> None:
@@ -21,7 +21,7 @@ from __future__ import annotations
 
 from typing import Dict, Tuple, Optional
 
-from state import GameStateTD, ensure_player, type_id
+from state import ZONE_BAG, GameStateTD, ensure_player, type_id
 
 
 # -------------------------------------------------
@@ -40,32 +40,42 @@ def give_player_bag_subset(
     """
     ensure_player(state, player_id)
 
-    # Index box contents by type_id (deterministic order)
-    box_by_type: Dict[str, list[str]] = {}
-    for cid in state["box"]:
-        tid = state["chips"][cid]["type_id"]
-        box_by_type.setdefault(tid, []).append(cid)
+    box = state["box"]
+    box_by_type = state["box_by_type"]
 
-    for tid in box_by_type:
-        box_by_type[tid].sort()
-
-    # Execute requested moves
+    # Total per chip type: keys that normalize to the same type (e.g. value 1
+    # and "1") add up instead of one replacing the other
+    needs: Dict[str, int] = {}
     for (color, value), need in subset.items():
         tid = type_id(color, int(value))
-        available = box_by_type.get(tid, [])
-
-        if len(available) < need:
+        needs[tid] = needs.get(tid, 0) + need
+
+    # Pop requested chips off the per-type box buckets (smallest chip_id first),
+    # skipping entries that already left the box through other paths
+    taken: Dict[str, list[str]] = {}
+    for tid, need in needs.items():
+        bucket = box_by_type.get(tid, [])
+        got = taken[tid] = []
+        while bucket and len(got) < need:
+            cid = bucket.pop()
+            if cid in box:
+                got.append(cid)
+
+        if len(got) < need:
+            # put the popped chips back: a failed call leaves the box untouched
+            for t, cids in taken.items():
+                if cids:
+                    box_by_type[t].extend(reversed(cids))
             raise ValueError(
-                f"Not enough chips in box for {tid}: need={need}, available={len(available)}"
+                f"Not enough chips in box for {tid}: need={need}, available={len(got)}"
             )
 
-        for _ in range(need):
-            cid = available.pop(0)
+    moved = [cid for cids in taken.values() for cid in cids]
 
-            # box -> bag
-            state["box"].remove(cid)
-            state["bags"][player_id].append(cid)
-            state["where"][cid] = {"zone": "bag", "player": player_id}
+    # box -> bag, in one batch
+    box.difference_update(moved)
+    state["bags"][player_id].extend(moved)
+    state["where"].update(dict.fromkeys(moved, (ZONE_BAG, player_id)))
 
 
 # -------------------------------------------------
@@ -120,18 +130,20 @@ def apply_player_defaults(
     - starting rubies
     - starting droplet position
     - starting potion state
+
+    Values are coerced to real int/bool here, so round code reads them uncast.
     """
     ensure_player(state, player_id)
 
     ps = state["players"][player_id]
 
-    ps["rubies"] = int(start_rubies)
-    ps["droplet_pos"] = int(droplet_pos)
-    ps["potion_filled"] = bool(potion_filled)
+    ps.rubies = int(start_rubies)
+    ps.droplet_pos = int(droplet_pos)
+    ps.potion_filled = bool(potion_filled)
 
     if reset_coins_and_vp:
-        ps["coins"] = 0
-        ps["victory_points"] = 0
+        ps.coins = 0
+        ps.victory_points = 0
 
 
 def setup_players_base(
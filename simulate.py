@@ -8,6 +8,8 @@ Run:
 
 # simulate.py
 
+from typing import Dict, Iterable, List, Optional, Tuple
+
 from catalog import CHIPS
 from state import build_pool, validate_unique_location
 from setup import setup_new_game
@@ -56,6 +58,37 @@ def main() -> None:
     run_game(state, player_count=player_count, seed=42, gray_limit=7)
 
 
+def simulate_game_batch(
+    seeds: Iterable[int],
+    *,
+    player_count: int = PLAYER_COUNT,
+    gray_limit: int = 7,
+    bag_by_player: Optional[Dict[int, Dict[Tuple[str, int], int]]] = None,
+) -> List[Dict[int, Dict[str, int]]]:
+    """
+    Play one headless game per seed (every prompt takes its default, no logging)
+    and return the final {pid: {"victory_points", "coins", "rubies"}} per game.
+
+    For Monte-Carlo runs over gray_limit / starting-bag recipes.
+    """
+    finals: List[Dict[int, Dict[str, int]]] = []
+    for seed in seeds:
+        state = build_pool(CHIPS)
+        state["log_enabled"] = False
+        setup_new_game(state, player_count=player_count, bag_by_player=bag_by_player)
+        run_game(state, player_count=player_count, seed=seed, gray_limit=gray_limit, auto_mode=True)
+
+        finals.append({
+            pid: {
+                "victory_points": ps.victory_points,
+                "coins": ps.coins,
+                "rubies": ps.rubies,
+            }
+            for pid, ps in state["players"].items()
+        })
+    return finals
+
+
 if __name__ == "__main__":
     main()
 
@@ -15,7 +15,11 @@ by Sziller
 
 from __future__ import annotations
 
-from typing import Any, Dict, List, Literal, Optional, Set, TypedDict
+from collections import deque
+from dataclasses import dataclass
+from enum import IntEnum
+from functools import lru_cache
+from typing import Any, Deque, Dict, List, Literal, Optional, Set, TextIO, Tuple, TypedDict
 
 
 # -----------------------------
@@ -29,6 +33,7 @@ class EffectTD(TypedDict, total=False):
 class ChipTypeTD(TypedDict, total=False):
     type_id: str
     color: str
+    color_code: int        # Color value; dispatch/predicates use this, not `color`
     name_de: str
     value: int
     effects: List[EffectTD]
@@ -44,6 +49,17 @@ class ChipTD(TypedDict):
 # NEW: add "palm" as an identity-preserving location
 Zone = Literal["box", "bag", "palm", "desktop", "pot"]
 
+# Zone codes stored in `where` (small ints, no per-move dict allocation)
+ZONE_BAG = 0
+ZONE_PALM = 1
+ZONE_POT = 2
+ZONE_DESKTOP = 3
+ZONE_BOX = 4
+
+ZONE_NAMES: Tuple[Zone, ...] = ("bag", "palm", "pot", "desktop", "box")
+
+# `where` entry: (zone_code, player_id); player is None for box
+Location = Tuple[int, Optional[int]]
 
 
 class LocationTD(TypedDict):
@@ -51,23 +67,43 @@ class LocationTD(TypedDict):
     player: Optional[int]  # None for box
 
 
-class PlayerStateTD(TypedDict):
-    coins: int
-    victory_points: int
-    rubies: int
+@dataclass(slots=True)
+class PlayerState:
+    """
+    Central per-player stats. Slotted: every round phase reads/bumps these,
+    so field access is an attribute slot load instead of a dict lookup.
+    """
+    coins: int = 0
+    victory_points: int = 0
+    rubies: int = 0
 
     # Persistent placement head-start. Field index where chip placement "base" begins.
-    droplet_pos: int
+    droplet_pos: int = 0
     # NEW: Flask / potion state (persistent across rounds)
-    potion_filled: bool
+    potion_filled: bool = True
 
 
 class GameStateTD(TypedDict):
     chip_types: Dict[str, ChipTypeTD]
     chips: Dict[str, ChipTD]
-    where: Dict[str, LocationTD]
+    where: Dict[str, Location]
+
+    # Flat per-chip lookup tables (built once in build_pool, never mutated).
+    # Hot loops read these instead of walking chips -> chip_types.
+    chip_value: Dict[str, int]
+    chip_is_gray: Dict[str, bool]
+    chip_color: Dict[str, int]    # Color value
+    chip_type_id: Dict[str, str]
+    # Dense int index per chip (0..N-1, catalog order), for packed per-chip
+    # arrays; the zone containers themselves keep string ids.
+    chip_int_id: Dict[str, int]
 
     box: Set[str]
+    # Box chips bucketed by color; each bucket sorted DESCENDING so pop() yields the
+    # smallest chip_id. Chips that already left the box are skipped lazily on pop.
+    box_by_color: Dict[str, List[str]]
+    # Same, bucketed by type_id (used by setup.py to fill starting bags)
+    box_by_type: Dict[str, List[str]]
     bags: Dict[int, List[str]]
 
     # NEW: ephemeral inspection zone per player
@@ -75,32 +111,88 @@ class GameStateTD(TypedDict):
     desktops: Dict[int, List[str]]
     pots: Dict[int, List[str]]
 
-    # Centrally recorded player state
-    players: Dict[int, PlayerStateTD]
+    # Running pot sums per player, maintained by every pot mutator in actions.py
+    # (so pot_sums is O(1) instead of a rescan of the pot).
+    pot_gray_sum: Dict[int, int]
+    pot_total_sum: Dict[int, int]
+    # Per-player chip count by color in the pot (list index = Color code)
+    pot_color_counts: Dict[int, List[int]]
 
-    # Public, centrally recorded log entries (transparency)
-    public_log: List[str]
+    # Centrally recorded player state
+    players: Dict[int, PlayerState]
+    # Player ids ensure_player has already completed (later calls are no-ops)
+    ensured_players: Set[int]
+    # Seated player ids, frozen once per game (rounds.run_game)
+    player_ids: Tuple[int, ...]
+
+    # Public, centrally recorded log entries (transparency).
+    # Bounded (oldest entries drop off); if `public_log_sink` is set, entries are
+    # written there instead of being kept in memory.
+    public_log: Deque[str]
+    public_log_sink: Optional[TextIO]
+    # False = broadcasts are dropped unformatted (headless simulations)
+    log_enabled: bool
+    # Sequence number of the next log entry (entries ever appended) and each
+    # player's read position in it (rounds.drain_broadcast)
+    public_log_seq: int
+    log_cursors: Dict[int, int]
 
     # Event card system (deck without replacement)
-    event_deck: List[dict]        # list[EventCardTD], kept loose to avoid circular import typing
-    event_discard: List[dict]     # drawn cards in order
-    current_event: Optional[dict] # active card for the current round
+    event_deck: Tuple[Any, ...]   # EventCards, shuffled once per game; kept loose to avoid circular import typing
+    event_cursor: int             # index of the next card to deal from event_deck
+    event_discard: List[Any]      # drawn cards in order
+    current_event: Optional[Any]  # active card for the current round
 
     # Active round modifiers
-    active_blue_event: Optional[dict]   # the blue event card active for the current round
+    active_blue_event: Optional[Any]    # the blue event card active for the current round
+    active_blue_card_id: Optional[int]  # its EventID (None = no blue card active)
 
     # Round-scoped transient workspace (phase outputs, temporary calculations, etc.)
     round_ctx: Dict[str, Any]
 
+    # Non-interactive run: every prompt takes its default (see rounds._prompt)
+    auto_mode: bool
+    # Player-input provider (rounds.ConsoleIO interface); None = console
+    io: Optional[Any]
+
+
+# Max entries kept in state["public_log"] (long simulations would grow it without bound)
+PUBLIC_LOG_LIMIT = 100_000
+
+
+# -----------------------------
+# Color codes (small ints for hot loops)
+# -----------------------------
+class Color(IntEnum):
+    GRAY = 0
+    ORANGE = 1
+    RED = 2
+    BLUE = 3
+    YELLOW = 4
+    GREEN = 5
+    PURPLE = 6
+    BLACK = 7
+    GREENRED = 8
+
+
+# Catalog color string <-> Color (strings stay for UI / serialization only)
+COLOR_NAMES: Tuple[str, ...] = tuple(c.name.lower() for c in Color)   # index = code
+COLOR_CODES: Dict[str, Color] = {c.name.lower(): c for c in Color}
+
 
 # -----------------------------
 # ID helpers (stable & readable)
 # -----------------------------
+# Both are pure and see a small fixed input set (catalog denominations / chip
+# instances), so repeated pools (batch simulation) reuse the same str objects
+# and their cached hashes instead of formatting new ones.
+@lru_cache(maxsize=256)
 def type_id(color: str, value: int) -> str:
     """Return the canonical type_id for a chip denomination."""
     return f"{color}:{value}"
 
 
+@lru_cache(maxsize=4096)
 def chip_id(type_id_: str, serial: int) -> str:
     """Return the canonical chip_id for a specific physical chip instance."""
     return f"{type_id_}#{serial:04d}"
@@ -118,57 +210,92 @@ def build_pool(chips_def: List[Dict[str, Any]]) -> GameStateTD:
     where: Dict[str, LocationTD] = {}
     box: Set[str] = set()
 
+    chip_value: Dict[str, int] = {}
+    chip_is_gray: Dict[str, bool] = {}
+    chip_color: Dict[str, int] = {}
+    chip_type_id: Dict[str, str] = {}
+    chip_int_id: Dict[str, int] = {}
+    box_by_color: Dict[str, List[str]] = {}
+    box_by_type: Dict[str, List[str]] = {}
+
     for entry in chips_def:
         color = entry["color"]
         name_de = entry["name-DE"]
         inv: Dict[int, int] = entry["inv"]
 
+        if color not in COLOR_CODES:
+            raise ValueError(f"Unknown chip color in catalog: {color}")
+        color_code = COLOR_CODES[color]
+        is_gray = color_code == Color.GRAY
+
         for value, count in inv.items():
             tid = type_id(color, int(value))
 
             chip_types[tid] = {
                 "type_id": tid,
                 "color": color,
+                "color_code": color_code,
                 "name_de": name_de,
                 "value": int(value),
                 "effects": [],
                 "ui": {},
             }
 
-            for serial in range(1, int(count) + 1):
-                cid = chip_id(tid, serial)
-                chips[cid] = {"chip_id": cid, "type_id": tid, "state": {}}
-                where[cid] = {"zone": "box", "player": None}
-                box.add(cid)
+            # All instances of this type at once: one bulk update per table
+            cids = [chip_id(tid, serial) for serial in range(1, int(count) + 1)]
+            chips.update({cid: {"chip_id": cid, "type_id": tid, "state": {}} for cid in cids})
+            where.update(dict.fromkeys(cids, (ZONE_BOX, None)))
+            box.update(cids)
+
+            chip_value.update(dict.fromkeys(cids, int(value)))
+            chip_is_gray.update(dict.fromkeys(cids, is_gray))
+            chip_color.update(dict.fromkeys(cids, color_code))
+            chip_type_id.update(dict.fromkeys(cids, tid))
+            chip_int_id.update(zip(cids, range(len(chip_int_id), len(chip_int_id) + len(cids))))
+            box_by_color.setdefault(color, []).extend(cids)
+            box_by_type.setdefault(tid, []).extend(cids)
+
+    for bucket in (*box_by_color.values(), *box_by_type.values()):
+        bucket.sort(reverse=True)
 
     return {
         "chip_types": chip_types,
         "chips": chips,
         "where": where,
+        "chip_value": chip_value,
+        "chip_is_gray": chip_is_gray,
+        "chip_color": chip_color,
+        "chip_type_id": chip_type_id,
+        "chip_int_id": chip_int_id,
         "box": box,
+        "box_by_color": box_by_color,
+        "box_by_type": box_by_type,
         "bags": {},
         "palms": {},          # NEW
         "pots": {},
+        "pot_gray_sum": {},
+        "pot_total_sum": {},
+        "pot_color_counts": {},
         "desktops": {},
         "players": {},
-        "public_log": [],
-        "event_deck": [],
+        "ensured_players": set(),
+        "player_ids": (),
+        "public_log": deque(maxlen=PUBLIC_LOG_LIMIT),
+        "public_log_sink": None,
+        "log_enabled": True,
+        "public_log_seq": 0,
+        "log_cursors": {},
+        "event_deck": (),
+        "event_cursor": 0,
         "event_discard": [],
         "current_event": None,
         "active_blue_event": None,
+        "active_blue_card_id": None,
         "round_ctx": {},
+        "auto_mode": False,
+        "io": None,
     }
 
-def _new_player_state() -> PlayerStateTD:
-    return {
-        "coins": 0,
-        "victory_points": 0,
-        "rubies": 0,
-        "droplet_pos": 0,
-        "potion_filled": True,
-    }
-
-
 def ensure_player(state: GameStateTD, player_id: int) -> None:
     """
     Ensure the player's containers and central stats exist.
@@ -177,23 +304,26 @@ def ensure_player(state: GameStateTD, player_id: int) -> None:
     - This function guarantees structure (keys/containers).
     - It should NOT be the authoritative place for "starting rules".
       Starting rules belong in setup.py (initial conditions).
+    - Called on nearly every action; after the first call per player it only
+      does one set lookup.
     """
+    ensured = state["ensured_players"]
+    if player_id in ensured:
+        return
+
     state["bags"].setdefault(player_id, [])
     state["palms"].setdefault(player_id, [])
     state["desktops"].setdefault(player_id, [])
     state["pots"].setdefault(player_id, [])
+    state["pot_gray_sum"].setdefault(player_id, 0)
+    state["pot_total_sum"].setdefault(player_id, 0)
+    state["pot_color_counts"].setdefault(player_id, [0] * len(Color))
 
-    # Ensure players dict entry exists
-    state["players"].setdefault(player_id, _new_player_state())
-
-    # Set missing stat keys only (never overwrite)
-    ps = state["players"][player_id]
-    ps.setdefault("coins", 0)
-    ps.setdefault("victory_points", 0)
-    ps.setdefault("rubies", 0)            # <-- leave as 0 here
-    ps.setdefault("droplet_pos", 0)
-    ps.setdefault("potion_filled", True)
+    # Ensure players entry exists (never overwrite existing stats)
+    if player_id not in state["players"]:
+        state["players"][player_id] = PlayerState()   # rubies left at 0 here
 
+    ensured.add(player_id)
 
 
 def clear_round_ctx(state: GameStateTD) -> None:
@@ -203,53 +333,87 @@ def clear_round_ctx(state: GameStateTD) -> None:
     state["round_ctx"].clear()
 
 
+def location(state: GameStateTD, chip_id: str) -> LocationTD:
+    """
+    Readable view of a chip's `where` entry, e.g. {"zone": "pot", "player": 0}.
+    """
+    zone, player = state["where"][chip_id]
+    return {"zone": ZONE_NAMES[zone], "player": player}
+
+
 def validate_unique_location(state: GameStateTD) -> None:
     """
     Debug/integrity check:
     Ensures each chip appears in exactly one container consistent with `where`.
     """
-    seen: set[str] = set()
+    # One flag per chip, addressed by its dense int index (no set of strings)
+    index = state["chip_int_id"]
+    where = state["where"]
+    seen = bytearray(len(index))
 
     # box
     for cid in state["box"]:
-        assert cid not in seen, f"duplicate chip in containers: {cid}"
-        seen.add(cid)
-        loc = state["where"][cid]
-        assert loc["zone"] == "box" and loc["player"] is None, f"where mismatch for {cid}: {loc}"
+        i = index[cid]
+        assert not seen[i], f"duplicate chip in containers: {cid}"
+        seen[i] = 1
+        loc = where[cid]
+        assert loc == (ZONE_BOX, None), f"where mismatch for {cid}: {loc}"
 
     # bags
     for pid, bag in state["bags"].items():
+        expected = (ZONE_BAG, pid)
         for cid in bag:
-            assert cid not in seen, f"duplicate chip in containers: {cid}"
-            seen.add(cid)
-            loc = state["where"][cid]
-            assert loc["zone"] == "bag" and loc["player"] == pid, f"where mismatch for {cid}: {loc}"
+            i = index[cid]
+            assert not seen[i], f"duplicate chip in containers: {cid}"
+            seen[i] = 1
+            loc = where[cid]
+            assert loc == expected, f"where mismatch for {cid}: {loc}"
 
     # palms (NEW)
     for pid, palm in state["palms"].items():
+        expected = (ZONE_PALM, pid)
         for cid in palm:
-            assert cid not in seen, f"duplicate chip in containers: {cid}"
-            seen.add(cid)
-            loc = state["where"][cid]
-            assert loc["zone"] == "palm" and loc["player"] == pid, f"where mismatch for {cid}: {loc}"
-
-    # pots
+            i = index[cid]
+            assert not seen[i], f"duplicate chip in containers: {cid}"
+            seen[i] = 1
+            loc = where[cid]
+            assert loc == expected, f"where mismatch for {cid}: {loc}"
+
+    # pots: location and running-sum checks share one pass per pot
+    chip_value = state["chip_value"]
+    chip_is_gray = state["chip_is_gray"]
+    chip_color = state["chip_color"]
     for pid, pot in state["pots"].items():
+        expected = (ZONE_POT, pid)
+        total = gray = 0
+        counts = [0] * len(Color)
         for cid in pot:
-            assert cid not in seen, f"duplicate chip in containers: {cid}"
-            seen.add(cid)
-            loc = state["where"][cid]
-            assert loc["zone"] == "pot" and loc["player"] == pid, f"where mismatch for {cid}: {loc}"
+            i = index[cid]
+            assert not seen[i], f"duplicate chip in containers: {cid}"
+            seen[i] = 1
+            loc = where[cid]
+            assert loc == expected, f"where mismatch for {cid}: {loc}"
+            v = chip_value[cid]
+            total += v
+            if chip_is_gray[cid]:
+                gray += v
+            counts[chip_color[cid]] += 1
+        assert state["pot_total_sum"].get(pid, 0) == total, f"pot_total_sum drift for player {pid}"
+        assert state["pot_gray_sum"].get(pid, 0) == gray, f"pot_gray_sum drift for player {pid}"
+        assert state["pot_color_counts"].get(pid, counts) == counts, f"pot_color_counts drift for player {pid}"
 
     # desktops (NEW)
     for pid, desk in state["desktops"].items():
+        expected = (ZONE_DESKTOP, pid)
         for cid in desk:
-            assert cid not in seen, f"duplicate chip in containers: {cid}"
-            seen.add(cid)
-            loc = state["where"][cid]
-            assert loc["zone"] == "desktop" and loc["player"] == pid, f"where mismatch for {cid}: {loc}"
-
-    assert len(seen) == len(state["chips"]), (
-        f"some chips are in no container: seen={len(seen)} total={len(state['chips'])}"
+            i = index[cid]
+            assert not seen[i], f"duplicate chip in containers: {cid}"
+            seen[i] = 1
+            loc = where[cid]
+            assert loc == expected, f"where mismatch for {cid}: {loc}"
+
+    missing = seen.count(0)
+    assert not missing, (
+        f"some chips are in no container: seen={len(seen) - missing} total={len(seen)}"
     )
 
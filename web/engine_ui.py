@@ -11,41 +11,52 @@ The web templates and server must remain dumb.
 """
 
 from __future__ import annotations
-from typing import Any, Dict, List, Optional, TypedDict
-
+import sys
+from dataclasses import dataclass
+from typing import Any, Dict, FrozenSet, Optional, Tuple
+
+
+# Phase → allowed commands (PoC), in display order
+_PHASE_COMMAND_LIST: Dict[str, Tuple[str, ...]] = {
+    "EVENT":   ("ok",),
+    "DRAW":    ("draw", "stop"),
+    "EVAL":    ("ok",),
+    "BUY":     ("buy", "skip"),
+    "CLEANUP": ("ok",),
+}
 
-# Phase → allowed commands (PoC)
-PHASE_COMMANDS: Dict[str, List[str]] = {
-    "EVENT":   ["ok"],
-    "DRAW":    ["draw", "stop"],
-    "EVAL":    ["ok"],
-    "BUY":     ["buy", "skip"],
-    "CLEANUP": ["ok"],
+# Built once: O(1) membership per phase (interned keys) + the pre-joined text
+# used by prompts and rejections.
+PHASE_COMMANDS: Dict[str, FrozenSet[str]] = {
+    sys.intern(phase): frozenset(cmds) for phase, cmds in _PHASE_COMMAND_LIST.items()
+}
+PHASE_COMMANDS_DISPLAY: Dict[str, str] = {
+    sys.intern(phase): ", ".join(cmds) for phase, cmds in _PHASE_COMMAND_LIST.items()
 }
+_DEFAULT_COMMANDS: FrozenSet[str] = frozenset(("ok",))
+_DEFAULT_COMMANDS_DISPLAY = "ok"
 
 def normalize_cmd(text: str) -> str:
     return (text or "").strip().lower()
 
-def allowed_commands(state: dict) -> List[str]:
+def allowed_commands(state: dict) -> FrozenSet[str]:
     phase = str(state.get("phase", "EVENT"))
-    return PHASE_COMMANDS.get(phase, ["ok"])
-
-def compute_prompt(state: dict, pid: int) -> str:
-    round_idx = state.get("round_idx", "?")
-    phase = state.get("phase", "?")
-    current_pid = int(state.get("current_pid", 0))
-
-    if pid != current_pid:
-        return f"Round {round_idx} — Phase {phase}. Waiting for pid={current_pid}."
+    return PHASE_COMMANDS.get(phase, _DEFAULT_COMMANDS)
 
-    cmds = allowed_commands(state)
-    return f"Round {round_idx} — Phase {phase}. Enter one of: {', '.join(cmds)}"
-
-class UiActionTD(TypedDict, total=False):
+@dataclass(frozen=True, slots=True)
+class UiAction:
+    """One button in the actions fragment (templates read the attributes directly)."""
     action_id: str
     label: str
     enabled: bool
-    reason: str
+    reason: str = ""
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Plain dict for a JSON boundary (hand-written: no dataclasses.asdict deep copy)."""
+        d: Dict[str, Any] = {"action_id": self.action_id, "label": self.label, "enabled": self.enabled}
+        if self.reason:
+            d["reason"] = self.reason
+        return d
 
 
 # -------------------------------------------------------------------
@@ -99,6 +110,23 @@ def engine_apply_ui_action(state: Dict[str, Any], pid: int, action_id: str, payl
 # UI-facing logic (derived from engine hooks)
 # -------------------------------------------------------------------
 
+# Phase → current-player prompt template / confirm-button label (interned keys:
+# one dict hit per poll instead of an if-chain)
+PHASE_PROMPT_FMT: Dict[str, str] = {
+    sys.intern("EVENT"):   "Round {r} — Event phase: resolve the event card, then Confirm.",
+    sys.intern("DRAW"):    "Round {r} — Draw phase: draw chips (later UI), then Confirm.",
+    sys.intern("EVAL"):    "Round {r} — Eval phase: evaluate pot results, then Confirm.",
+    sys.intern("BUY"):     "Round {r} — Buy phase: buy chips (later UI), then Confirm.",
+    sys.intern("CLEANUP"): "Round {r} — Cleanup phase: reset for next round, then Confirm.",
+}
+PHASE_LABEL: Dict[str, str] = {
+    sys.intern("BUY"):   "Confirm / Finish buying",
+    sys.intern("DRAW"):  "Confirm / Finish drawing",
+    sys.intern("EVENT"): "Confirm / Finish event",
+}
+_DEFAULT_LABEL = "Confirm / Next"
+
+
 def compute_prompt(state: dict, pid: int) -> str:
     round_idx = state.get("round_idx", "?")
     phase = state.get("phase", "?")
@@ -108,46 +136,32 @@ def compute_prompt(state: dict, pid: int) -> str:
         return f"Round {round_idx} — Phase {phase}. Waiting for pid={current_pid}."
 
     # Current player prompt (phase-specific)
-    if phase == "EVENT":
-        return f"Round {round_idx} — Event phase: resolve the event card, then Confirm."
-    if phase == "DRAW":
-        return f"Round {round_idx} — Draw phase: draw chips (later UI), then Confirm."
-    if phase == "EVAL":
-        return f"Round {round_idx} — Eval phase: evaluate pot results, then Confirm."
-    if phase == "BUY":
-        return f"Round {round_idx} — Buy phase: buy chips (later UI), then Confirm."
-    if phase == "CLEANUP":
-        return f"Round {round_idx} — Cleanup phase: reset for next round, then Confirm."
+    fmt = PHASE_PROMPT_FMT.get(phase)
+    if fmt is not None:
+        return fmt.format(r=round_idx)
 
     return f"Round {round_idx} — Phase {phase}. Your turn. Confirm to continue."
 
 
-def legal_actions(state: dict, pid: int) -> list[dict]:
+def legal_actions(state: dict, pid: int) -> list[UiAction]:
     current_pid = int(state.get("current_pid", 0))
     phase = state.get("phase", "?")
 
     # Not your turn => everything disabled
     if pid != current_pid:
         return [
-            {"action_id": "confirm", "label": "Confirm / Next", "enabled": False, "reason": "Not your turn."}
+            UiAction("confirm", _DEFAULT_LABEL, False, "Not your turn.")
         ]
 
     # Your turn => confirm enabled
     # (Later you will add phase-specific actions here.)
-    label = "Confirm / Next"
-    if phase == "BUY":
-        label = "Confirm / Finish buying"
-    elif phase == "DRAW":
-        label = "Confirm / Finish drawing"
-    elif phase == "EVENT":
-        label = "Confirm / Finish event"
+    label = PHASE_LABEL.get(phase, _DEFAULT_LABEL)
 
     return [
-        {"action_id": "confirm", "label": label, "enabled": True}
+        UiAction("confirm", label, True)
     ]
 
 
-
 def apply_action(state: Dict[str, Any], pid: int, action_id: str, payload: Optional[Dict[str, Any]] = None) -> None:
     """
     Single entry point for the web layer.
@@ -169,9 +183,10 @@ def apply_text_input(sess, pid: int, text: str) -> bool:
         sess.add_log(f"Rejected input '{cmd}' from pid={pid}: not your turn.")
         return False
 
-    allowed = PHASE_COMMANDS.get(phase, ["ok"])
+    allowed = PHASE_COMMANDS.get(phase, _DEFAULT_COMMANDS)
     if cmd not in allowed:
-        sess.add_log(f"Rejected input '{cmd}' in phase {phase}. Allowed: {', '.join(allowed)}")
+        allowed_text = PHASE_COMMANDS_DISPLAY.get(phase, _DEFAULT_COMMANDS_DISPLAY)
+        sess.add_log(f"Rejected input '{cmd}' in phase {phase}. Allowed: {allowed_text}")
         return False
 
     # Phase-specific PoC effects
@@ -12,10 +12,16 @@ Later, you will replace `advance()` with calls into your real rounds/phase logic
 
 from __future__ import annotations
 
+from collections import deque
 from dataclasses import dataclass, field
-from typing import Dict, List, Optional
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
 import secrets
 import time
+import uuid
+
+
+# Max lines kept in a session log
+LOG_LIMIT = 500
 
 
 PHASES: List[str] = [
@@ -31,16 +37,42 @@ def _now_ts() -> float:
     return time.time()
 
 
-def _new_id(nbytes: int = 8) -> str:
-    return secrets.token_hex(nbytes)
+# Last formatted log timestamp, reused while the wall-clock second is unchanged
+_ts_sec: int = -1
+_ts_str: str = ""
 
 
-@dataclass
+def _log_ts() -> str:
+    """HH:MM:SS for now; strftime runs at most once per second."""
+    global _ts_sec, _ts_str
+    sec = int(time.time())
+    if sec != _ts_sec:
+        _ts_str = time.strftime("%H:%M:%S", time.localtime(sec))
+        _ts_sec = sec
+    return _ts_str
+
+
+def _new_id() -> str:
+    return uuid.uuid4().hex
+
+
+# Join codes: short, lowercase, without look-alike characters (i/l/1, o/0)
+JOIN_CODE_ALPHABET = "abcdefghjkmnpqrstuvwxyz23456789"
+JOIN_CODE_LEN = 5
+JOIN_CODE_POOL_SIZE = 512
+
+
+@dataclass(slots=True)
 class Player:
     pid: int
     name: str
     joined_ts: float = field(default_factory=_now_ts)
 
+    def __post_init__(self) -> None:
+        # Types are fixed here, once per join, so views read pid/name uncoerced
+        self.pid = int(self.pid)
+        self.name = str(self.name)
+
 
 @dataclass
 class GameSession:
@@ -55,38 +87,90 @@ class GameSession:
     phase_idx: int = 0
     current_pid: int = 0
 
-    log: List[str] = field(default_factory=list)
+    # Bounded: oldest lines drop off (the log fragment shows only the tail anyway)
+    log: Deque[str] = field(default_factory=lambda: deque(maxlen=LOG_LIMIT))
     state: dict = field(default_factory=dict)
     pending_text_by_pid: Dict[int, str] = field(default_factory=dict)
 
+    # Bumped on every visible change (cursor sync, log line); the polled
+    # fragments send it as their ETag.
+    _version: int = field(default=0, repr=False)
+    # views.build_public_view's UiView per pid, valid for _view_cache_version
+    # only (emptied on the first build after a _version bump)
+    _view_cache: Dict[int, Any] = field(default_factory=dict, repr=False)
+    _view_cache_version: int = field(default=-1, repr=False)
+
+    # Rendered HTML for fragments that only change on join (inputbar, players);
+    # add_player drops the roster-dependent entries.
+    _html_cache: Dict[str, str] = field(default_factory=dict, repr=False)
+
+    # Next pid to hand out (pids are never reused)
+    _next_pid: int = field(default=0, repr=False)
+
+    # Turn order (sorted pids, rebuilt on join) and current_pid's index in it
+    _turn_order: Tuple[int, ...] = field(default=(), repr=False)
+    _turn_idx: int = field(default=0, repr=False)
+
+    # What sync_state_from_cursor still has to copy into `state`: the cursor
+    # (set by advance) and the roster (set by add_player)
+    _cursor_dirty: bool = field(default=True, repr=False)
+    _players_dirty: bool = field(default=True, repr=False)
+
     def phase_name(self) -> str:
         return PHASES[self.phase_idx]
 
     def add_log(self, msg: str) -> None:
-        self.log.append(f"{time.strftime('%H:%M:%S')} | {msg}")
+        self.log.append(f"{_log_ts()} | {msg}")
+        self._version += 1
 
     def add_player(self, name: str) -> Player:
-        pid = 0 if not self.players else (max(self.players.keys()) + 1)
+        pid = self._next_pid
+        self._next_pid += 1
         p = Player(pid=pid, name=name)
         self.players[pid] = p
+        self._turn_order = tuple(sorted(self.players))
+        for key in [k for k in self._html_cache if k.startswith("players:")]:
+            del self._html_cache[key]
+        self._players_dirty = True
         self.add_log(f"Player joined: pid={pid} name={name}")
         # Default host is pid 0; current_pid stays 0 unless you want “last join becomes active”.
         self.sync_state_from_cursor()  # TODO check if needed
         return p
 
+    def cached_html(self, key: str, render: Callable[[], str]) -> str:
+        """Return the rendered fragment stored under `key`, rendering it on first use."""
+        html = self._html_cache.get(key)
+        if html is None:
+            html = self._html_cache[key] = render()
+        return html
+
     def sync_state_from_cursor(self) -> None:
         """
         Keep `self.state` in sync with the PoC cursor fields.
 
         This is a transitional bridge so the UI can read from `self.state`
         now, and later you can replace `self.state` with real GameStateTD.
+
+        Only the parts flagged dirty are rewritten: a call after a rejected
+        input or a plain log line leaves `state` untouched.
         """
-        self.state["round_idx"] = self.round_idx
-        self.state["phase"] = self.phase_name()
-        self.state["current_pid"] = self.current_pid
-        self.state["log"] = self.log
-        self.state["players"] = [{"pid": p.pid, "name": p.name} for p in self.players.values()]
-        self.state["join_code"] = self.join_code
+        if self._cursor_dirty:
+            state = self.state
+            state["round_idx"] = self.round_idx
+            state["phase"] = self.phase_name()
+            state["current_pid"] = self.current_pid
+            self._cursor_dirty = False
+
+            self._version += 1
+
+        if self._players_dirty:
+            state = self.state
+            state["players"] = [{"pid": p.pid, "name": p.name} for p in self.players.values()]
+            # log deque / join code never get replaced: bind them with the roster
+            state["log"] = self.log
+            state["join_code"] = self.join_code
+            self._players_dirty = False
+            self._version += 1
 
     def advance(self, pid: int) -> None:
         """
@@ -100,14 +184,15 @@ class GameSession:
 
         old_phase = self.phase_name()
         self.phase_idx += 1
+        self._cursor_dirty = True
         if self.phase_idx >= len(PHASES):
             self.phase_idx = 0
             self.round_idx += 1
             # rotate current player
-            if self.players:
-                pids = sorted(self.players.keys())
-                cur_i = pids.index(self.current_pid) if self.current_pid in pids else 0
-                self.current_pid = pids[(cur_i + 1) % len(pids)]
+            order = self._turn_order
+            if order:
+                self._turn_idx = (self._turn_idx + 1) % len(order)
+                self.current_pid = order[self._turn_idx]
             self.add_log(f"Round advanced to {self.round_idx}. Current player pid={self.current_pid}.")
         else:
             self.add_log(f"Phase advanced: {old_phase} -> {self.phase_name()}")
@@ -148,10 +233,29 @@ class GameManager:
     def __init__(self) -> None:
         self._games: Dict[str, GameSession] = {}
         self._code_to_gid: Dict[str, str] = {}
+        self._code_pool: Deque[str] = deque()
+        self._refill_codes()
+
+    def _refill_codes(self) -> None:
+        """
+        Pre-generate unused join codes (CSPRNG: codes grant access to a game).
+        Codes already handed out or pooled are skipped, so two games never share one.
+        """
+        pooled = set(self._code_pool)
+        while len(pooled) < JOIN_CODE_POOL_SIZE:
+            code = "".join(secrets.choice(JOIN_CODE_ALPHABET) for _ in range(JOIN_CODE_LEN))
+            if code not in pooled and code not in self._code_to_gid:
+                pooled.add(code)
+                self._code_pool.append(code)
+
+    def _next_join_code(self) -> str:
+        if not self._code_pool:
+            self._refill_codes()
+        return self._code_pool.popleft()
 
     def create_game(self, host_name: str) -> GameSession:
-        gid = _new_id(8)
-        code = _new_id(3)  # short join code
+        gid = _new_id()
+        code = self._next_join_code()  # short join code
         session = GameSession(game_id=gid, join_code=code)
         session.add_player(host_name)  # pid=0
         session.add_log(f"Game created. join_code={code}")
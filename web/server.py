@@ -11,13 +11,16 @@ LAN:
 
 from __future__ import annotations
 
-from fastapi import FastAPI, Form, Request
-from fastapi.responses import HTMLResponse, RedirectResponse
+from typing import Any, Dict
+
+from fastapi import Depends, FastAPI, Form, HTTPException, Request
+from fastapi.responses import HTMLResponse, RedirectResponse, Response
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
+from jinja2 import FileSystemBytecodeCache
 from fastapi.responses import HTMLResponse  # ensure this import exists
 
-from .game_manager import GameManager
+from .game_manager import GameManager, GameSession
 from .views import build_public_view
 from . import engine_ui
 
@@ -27,6 +30,64 @@ gm = GameManager()
 # Static + templates
 app.mount("/static", StaticFiles(directory="web/static"), name="static")
 templates = Jinja2Templates(directory="web/templates")
+# Templates only change on deploy (restart the server after editing them): skip
+# the per-render mtime check and keep compiled bytecode across restarts.
+# Autoescape stays on: fragments interpolate player names.
+templates.env.auto_reload = False
+templates.env.bytecode_cache = FileSystemBytecodeCache()  # per-user temp dir
+
+
+def _render(name: str, context: dict) -> str:
+    """Render a template to a string (for fragments cached on the session)."""
+    return templates.get_template(name).render(context)
+
+
+# Polled fragments carry the session version as a weak ETag; `no-cache` makes the
+# browser revalidate each poll, so an idle game answers with a bodiless 304.
+def _etag(sess: GameSession) -> str:
+    return f'W/"{sess._version}"'
+
+
+class _NotModified(Exception):
+    def __init__(self, etag: str) -> None:
+        self.etag = etag
+
+
+@app.exception_handler(_NotModified)
+def _not_modified_response(request: Request, exc: _NotModified) -> Response:
+    return Response(status_code=304, headers={"ETag": exc.etag, "Cache-Control": "no-cache"})
+
+
+def _tagged(resp: Response, etag: str) -> Response:
+    resp.headers["ETag"] = etag
+    resp.headers["Cache-Control"] = "no-cache"
+    return resp
+
+
+# -----------------------------
+# Fragment dependencies (resolved once per request by FastAPI)
+# -----------------------------
+def get_session(game_id: str) -> GameSession:
+    sess = gm.get_game(game_id)
+    if not sess:
+        raise HTTPException(status_code=404, detail="Unknown game")
+    return sess
+
+
+def fragment_etag(request: Request, sess: GameSession = Depends(get_session)) -> str:
+    """The fragment's ETag; an unchanged session ends the request here with a 304."""
+    etag = _etag(sess)
+    if request.headers.get("if-none-match") == etag:
+        raise _NotModified(etag)
+    return etag
+
+
+def get_public_view(
+    pid: int,
+    sess: GameSession = Depends(get_session),
+    etag: str = Depends(fragment_etag),   # 304 check runs before the view is built
+) -> Dict[str, Any]:
+    return build_public_view(sess, pid=pid)
 
 
 # -----------------------------
@@ -76,19 +137,16 @@ def game_page(request: Request, game_id: str, pid: int) -> HTMLResponse:
 # Fragments for polling (HTMX)
 # -----------------------------
 @app.get("/g/{game_id}/f/prompt", response_class=HTMLResponse)
-def fragment_prompt(request: Request, game_id: str, pid: int) -> HTMLResponse:
-
-    sess = gm.get_game(game_id)
-    if not sess:
-        return HTMLResponse("Unknown game", status_code=404)
-
-    pub = build_public_view(sess, pid=pid)
-    print("PROMPT ROUTE DEBUG pub =", pub)
-    print("PROMPT ROUTE DEBUG ui.prompt =", pub.get("ui", {}).get("prompt"))
-    return templates.TemplateResponse(
+def fragment_prompt(
+    request: Request,
+    etag: str = Depends(fragment_etag),
+    pub: Dict[str, Any] = Depends(get_public_view),
+) -> Response:
+    resp = templates.TemplateResponse(
         "fragments/prompt.html",
         {"request": request, "ui": pub["ui"]},
     )
+    return _tagged(resp, etag)
 
 
 @app.post("/g/{game_id}/input")
@@ -112,67 +170,68 @@ def post_input(game_id: str, pid: int = Form(...), text: str = Form("")) -> Redi
 
 
 @app.get("/g/{game_id}/f/inputbar", response_class=HTMLResponse)
-def fragment_inputbar(request: Request, game_id: str, pid: int) -> HTMLResponse:
-    sess = gm.get_game(game_id)
-    if not sess:
-        return HTMLResponse("Unknown game", status_code=404)
-
-    # We don't even need the full view here, but it’s fine if you want it later.
-    return templates.TemplateResponse(
-        "fragments/inputbar.html",
-        {"request": request, "game_id": sess.game_id, "join_code": sess.join_code, "pid": pid},
+def fragment_inputbar(
+    request: Request,
+    pid: int,
+    sess: GameSession = Depends(get_session),
+    etag: str = Depends(fragment_etag),
+) -> Response:
+    # Depends only on game_id/join_code/pid: rendered once per pid, then served as-is
+    html = sess.cached_html(
+        f"inputbar:{pid}",
+        lambda: _render(
+            "fragments/inputbar.html",
+            {"request": request, "game_id": sess.game_id, "join_code": sess.join_code, "pid": pid},
+        ),
     )
-
-@app.post("/g/{game_id}/input")
-def post_input(
-    game_id: str,
-    pid: int = Form(...),
-    text: str = Form(...),
-) -> RedirectResponse:
-    sess = gm.get_game(game_id)
-    if not sess:
-        return RedirectResponse(url="/?err=unknown_game", status_code=303)
-
-    sess.submit_text(pid=pid, text=text)
-
-    return RedirectResponse(url=f"/g/{game_id}?pid={pid}", status_code=303)
+    return _tagged(HTMLResponse(html), etag)
 
 
 @app.get("/g/{game_id}/f/board", response_class=HTMLResponse)
-def fragment_board(request: Request, game_id: str, pid: int) -> HTMLResponse:
-    sess = gm.get_game(game_id)
-    if not sess:
-        return HTMLResponse("Unknown game", status_code=404)
-
-    pub = build_public_view(sess, pid=pid)
-    return templates.TemplateResponse(
+def fragment_board(
+    request: Request,
+    pid: int,
+    sess: GameSession = Depends(get_session),
+    etag: str = Depends(fragment_etag),
+    pub: Dict[str, Any] = Depends(get_public_view),
+) -> Response:
+    resp = templates.TemplateResponse(
         "fragments/board.html",
         {"request": request, "game_id": sess.game_id, "join_code": sess.join_code, "pid": pid, "ui": pub["ui"]},
     )
+    return _tagged(resp, etag)
 
 
 @app.get("/g/{game_id}/f/players", response_class=HTMLResponse)
-def fragment_players(request: Request, game_id: str, pid: int) -> HTMLResponse:
-    sess = gm.get_game(game_id)
-    if not sess:
-        return HTMLResponse("Unknown game", status_code=404)
-
-    pub = build_public_view(sess, pid=pid)
-    return templates.TemplateResponse(
-        "fragments/players.html",
-        {"request": request, "game_id": sess.game_id, "join_code": sess.join_code, "pid": pid, "ui": pub["ui"]},
+def fragment_players(
+    request: Request,
+    pid: int,
+    sess: GameSession = Depends(get_session),
+    etag: str = Depends(fragment_etag),
+) -> Response:
+    # Roster + current-player highlight only: cached per current_pid until the next join
+    html = sess.cached_html(
+        f"players:{sess.current_pid}",
+        lambda: _render(
+            "fragments/players.html",
+            {"request": request, "game_id": sess.game_id, "join_code": sess.join_code, "pid": pid,
+             "ui": build_public_view(sess, pid=pid)["ui"]},
+        ),
     )
+    return _tagged(HTMLResponse(html), etag)
 
-@app.get("/g/{game_id}/f/prompt_input", response_class=HTMLResponse)
-def fragment_prompt_input(request: Request, game_id: str, pid: int) -> HTMLResponse:
-    sess = gm.get_game(game_id)
-    if not sess:
-        return HTMLResponse("Unknown game", status_code=404)
 
-    pub = build_public_view(sess, pid=pid)
+@app.get("/g/{game_id}/f/prompt_input", response_class=HTMLResponse)
+def fragment_prompt_input(
+    request: Request,
+    pid: int,
+    sess: GameSession = Depends(get_session),
+    etag: str = Depends(fragment_etag),
+    pub: Dict[str, Any] = Depends(get_public_view),
+) -> Response:
     is_my_turn = (pid == sess.current_pid)
 
-    return templates.TemplateResponse(
+    resp = templates.TemplateResponse(
         "fragments/prompt_input.html",
         {
             "request": request,
@@ -183,32 +242,37 @@ def fragment_prompt_input(request: Request, game_id: str, pid: int) -> HTMLRespo
             "current_pid": sess.current_pid,
         },
     )
+    return _tagged(resp, etag)
 
 
 @app.get("/g/{game_id}/f/actions", response_class=HTMLResponse)
-def fragment_actions(request: Request, game_id: str, pid: int) -> HTMLResponse:
-    sess = gm.get_game(game_id)
-    if not sess:
-        return HTMLResponse("Unknown game", status_code=404)
-
-    pub = build_public_view(sess, pid=pid)
-    return templates.TemplateResponse(
+def fragment_actions(
+    request: Request,
+    pid: int,
+    sess: GameSession = Depends(get_session),
+    etag: str = Depends(fragment_etag),
+    pub: Dict[str, Any] = Depends(get_public_view),
+) -> Response:
+    resp = templates.TemplateResponse(
         "fragments/actions.html",
         {"request": request, "game_id": sess.game_id, "join_code": sess.join_code, "pid": pid, "ui": pub["ui"]},
     )
+    return _tagged(resp, etag)
 
 
 @app.get("/g/{game_id}/f/log", response_class=HTMLResponse)
-def fragment_log(request: Request, game_id: str, pid: int) -> HTMLResponse:
-    sess = gm.get_game(game_id)
-    if not sess:
-        return HTMLResponse("Unknown game", status_code=404)
-
-    pub = build_public_view(sess, pid=pid)
-    return templates.TemplateResponse(
+def fragment_log(
+    request: Request,
+    pid: int,
+    sess: GameSession = Depends(get_session),
+    etag: str = Depends(fragment_etag),
+    pub: Dict[str, Any] = Depends(get_public_view),
+) -> Response:
+    resp = templates.TemplateResponse(
         "fragments/log.html",
         {"request": request, "game_id": sess.game_id, "join_code": sess.join_code, "pid": pid, "ui": pub["ui"]},
     )
+    return _tagged(resp, etag)
 
 
 # -----------------------------
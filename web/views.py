@@ -8,59 +8,60 @@ can render. The web layer should not interpret engine state; it renders this vie
 PoC contract expected by web/server.py:
 
 build_public_view(sess, pid) -> {
-  "ui": {
-    "prompt": str,
-    "actions": [ {action_id,label,enabled,reason?}, ... ],
-    "board": {...},
-    "players": [...],
-    "log": [...]
-  },
+  "ui": UiView(
+    prompt: str,
+    actions: ( UiAction(action_id,label,enabled,reason), ... ),
+    board: {...},
+    players: ({pid, name}, ...),
+    log: (...)
+  ),
   "meta": {... optional ...}
 }
 """
 
 from __future__ import annotations
-from typing import Any, Dict, List, TypedDict, Optional
+from dataclasses import dataclass
+from itertools import islice
+from types import MappingProxyType
+from typing import Any, Dict, Mapping, Tuple
 from . import engine_ui
+from .engine_ui import UiAction
 
 
-class UiActionTD(TypedDict, total=False):
-    action_id: str
-    label: str
-    enabled: bool
-    reason: str
+@dataclass(frozen=True, slots=True)
+class UiView:
+    """
+    What the templates render as `ui`. Slotted: Jinja resolves `ui.prompt`
+    etc. with a direct attribute load (a dict makes it try getattr first,
+    fail, then fall back to item lookup). Frozen, with read-only members:
+    one cached instance is handed to every poll of the same session version.
+    """
+    prompt: str
+    actions: Tuple[UiAction, ...]
+    board: Mapping[str, Any]
+    players: Tuple[Mapping[str, Any], ...]
+    log: Tuple[str, ...]
 
 
-class UiViewTD(TypedDict):
-    prompt: str
-    actions: List[UiActionTD]
-    board: Dict[str, Any]
-    players: List[Dict[str, Any]]
-    log: List[str]
-
-
-def _compute_prompt(round_idx: int, phase: str, current_pid: int, pid: int) -> str:
-    if pid != current_pid:
-        return f"Round {round_idx} — Phase {phase}. Waiting for pid={current_pid} to act."
-    return f"Round {round_idx} — Phase {phase}. Your turn (pid={pid}). Choose an action."
-
-
-def _legal_actions(current_pid: int, pid: int) -> List[UiActionTD]:
-    if pid != current_pid:
-        return [
-            {
-                "action_id": "noop",
-                "label": "Waiting…",
-                "enabled": False,
-                "reason": "Not your turn.",
-            }
-        ]
-    return [
-        {"action_id": "confirm", "label": "Confirm / Next", "enabled": True},
-    ]
-
-from typing import Any, Dict, List
-from . import engine_ui
+# Engine adapters called on every view build, resolved once at import
+_compute_prompt_ext = engine_ui.compute_prompt
+_legal_actions_ext = engine_ui.legal_actions
+
+
+# Log lines sent to the page / log fragment
+LOG_TAIL = 200
+
+# Shared (read-only) `meta` of every view: nothing to report yet
+_EMPTY_META: Mapping[str, Any] = MappingProxyType({})
+
+
+def _log_tail(log: Any, n: int) -> Tuple[str, ...]:
+    """Last `n` lines of a log list or deque, without copying the whole log."""
+    return tuple(islice(log, max(len(log) - n, 0), None))
+
+
+# Stand-in roster for session objects that carry none (GameSession always has one)
+_NO_PLAYERS: Dict[int, Any] = {}
 
 
 def build_public_view(sess: Any, pid: int) -> Dict[str, Any]:
@@ -68,30 +69,63 @@ def build_public_view(sess: Any, pid: int) -> Dict[str, Any]:
     Expects sess.state to be the engine state dict (or GameStateTD).
     If you don't have sess.state yet, see Step 3.
     """
-    state = getattr(sess, "state", None)
+    # One snapshot of the instance dict: missing attributes become dict misses
+    # instead of getattr raising and swallowing AttributeError.
+    d = getattr(sess, "__dict__", None) or {}
+
+    # The one view cache: sessions that version their visible changes
+    # (_version moves on every cursor sync, join and log line) get the same
+    # immutable UiView back for every poll until the next bump.
+    view_cache = d.get("_view_cache")
+    version = d.get("_version")
+    if view_cache is not None and version is not None:
+        if d.get("_view_cache_version") != version:
+            view_cache.clear()
+            sess._view_cache_version = version
+        else:
+            ui = view_cache.get(pid)
+            if ui is not None:
+                return {"ui": ui, "meta": _EMPTY_META}
+    else:
+        view_cache = None
+
+    round_idx_fallback = d.get("round_idx", 1)
+    phase_fallback = d.get("phase", "EVENT")
+    current_pid_fallback = d.get("current_pid", 0)
+    players = d.get("players", _NO_PLAYERS)
+
+    state = d.get("state")
     if state is None:
         # Backwards compatibility: allow the old cursor-style session
+        phase_name_fn = getattr(sess, "phase_name", None)   # one probe, no hasattr
         state = {
-            "round_idx": getattr(sess, "round_idx", 1),
-            "phase": sess.phase_name() if hasattr(sess, "phase_name") else getattr(sess, "phase", "EVENT"),
-            "current_pid": getattr(sess, "current_pid", 0),
-            "log": getattr(sess, "log", []),
+            "round_idx": round_idx_fallback,
+            "phase": phase_name_fn() if phase_name_fn is not None else phase_fallback,
+            "current_pid": current_pid_fallback,
+            "log": d.get("log", []),
         }
 
-    ui = {
-        "prompt": engine_ui.compute_prompt(state, pid),
-        "actions": engine_ui.legal_actions(state, pid),
-        "board": {
-            "round_idx": state.get("round_idx", getattr(sess, "round_idx", 1)),
-            "phase": state.get("phase", getattr(sess, "phase", "EVENT")),
-            "current_pid": state.get("current_pid", getattr(sess, "current_pid", 0)),
-        },
+    # Engine state normally carries the cursor; fall back only on a miss
+    round_idx = state.get("round_idx")
+    if round_idx is None:
+        round_idx = round_idx_fallback
+    phase = state.get("phase")
+    if phase is None:
+        phase = phase_fallback
+    current_pid = state.get("current_pid")
+    if current_pid is None:
+        current_pid = current_pid_fallback
+
+    ui = UiView(
+        prompt=_compute_prompt_ext(state, pid),
+        actions=tuple(_legal_actions_ext(state, pid)),
+        board=MappingProxyType({"round_idx": round_idx, "phase": phase, "current_pid": current_pid}),
         # For now: keep players from session until you move them into engine state
-        "players": [{"pid": int(p.pid), "name": str(p.name)} for p in getattr(sess, "players", {}).values()]
-                   if isinstance(getattr(sess, "players", None), dict)
-                   else [],
-        "log": list(state.get("log", []))[-200:],
-    }
-
-    return {"ui": ui, "meta": {}}
-
+        # (pid/name are already int/str on GameSession's Player)
+        players=tuple(MappingProxyType({"pid": p.pid, "name": p.name}) for p in players.values()),
+        log=_log_tail(state.get("log", []), LOG_TAIL),
+    )
+
+    if view_cache is not None:
+        view_cache[pid] = ui
+    return {"ui": ui, "meta": _EMPTY_META}